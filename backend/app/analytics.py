@@ -180,7 +180,7 @@ class AnalyticsEngine:
                     [
                         state,
                         row["crop"],
-                        float(round(float(row["production_tonnes"]), 2)),
+                        round(float(row["production_tonnes"]), 2),
                     ]
                 )
 
@@ -248,7 +248,7 @@ class AnalyticsEngine:
         else:
             max_row = state_a_rows.loc[state_a_rows["production_tonnes"].idxmax()]
             rows.append(
-                [state_a, max_row["district"], float(round(float(max_row["production_tonnes"]), 2))]
+                [state_a, max_row["district"], round(float(max_row["production_tonnes"]), 2)]
             )
             parts.append(
                 f"{state_a}'s peak output came from {max_row['district']} "
@@ -261,7 +261,7 @@ class AnalyticsEngine:
         else:
             min_row = state_b_rows.loc[state_b_rows["production_tonnes"].idxmin()]
             rows.append(
-                [state_b, min_row["district"], float(round(float(min_row["production_tonnes"]), 2))]
+                [state_b, min_row["district"], round(float(min_row["production_tonnes"]), 2)]
             )
             parts.append(
                 f"{state_b}'s lowest output was {min_row['district']} at {min_row['production_tonnes']:.1f} tonnes."
@@ -328,8 +328,8 @@ class AnalyticsEngine:
             rows=[
                 [
                     int(row["year"]),
-                    float(round(float(row["production_tonnes"]), 2)),
-                    float(round(float(row["annual_rainfall_mm"]), 1)),
+                    round(float(row["production_tonnes"]), 2),
+                    round(float(row["annual_rainfall_mm"]), 1),
                 ]
                 for _, row in merged.iterrows()
             ],
@@ -401,7 +401,7 @@ class AnalyticsEngine:
                     title=f"{crop} production",
                     headers=["Year", "Production (tonnes)"],
                     rows=[
-                        [int(row["year"]), float(round(float(row["production_tonnes"]), 2))]
+                        [int(row["year"]), round(float(row["production_tonnes"]), 2)]
                         for _, row in crop_series.iterrows()
                     ],
                 )
@@ -419,7 +419,7 @@ class AnalyticsEngine:
                     title="Rainfall context",
                     headers=["Year", "Rainfall (mm)"],
                     rows=[
-                        [int(row["year"]), float(round(float(row["annual_rainfall_mm"]), 1))]
+                        [int(row["year"]), round(float(row["annual_rainfall_mm"]), 1)]
                         for _, row in rainfall.iterrows()
                     ],
                 )
@@ -440,7 +440,7 @@ class AnalyticsEngine:
             row = [int(year)]
             for state in states:
                 value = pivot.get(state, {}).get(year, None)
-                row.append(float(round(float(value), 1)) if value is not None else None)
+                row.append(round(float(value), 1) if value is not None else None)
             rows.append(row)
         return rows
 
@@ -1,8 +1,9 @@
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import httpx
 import pandas as pd
@@ -12,11 +13,23 @@ class DatasetConfig(Dict):
     """Typed helper for IDEs."""
 
 
+# Low-cardinality label columns stored as categoricals so filters and groupbys compare int codes
+CATEGORICAL_COLUMNS = ("state", "district", "crop", "crop_lower")
+# Columns added by _prepare_columns for the query pipeline; not part of the source schema
+DERIVED_COLUMNS = ("crop_lower",)
+
+
 class DataManager:
     def __init__(self, config: Dict):
         self._app_cfg = config.get("app", {})
         self._datasets = config.get("datasets", {})
         self._cache: Dict[str, pd.DataFrame] = {}
+        # Lookup structures derived from a cached dataset, keyed by (dataset name, kind, args)
+        self._derived: Dict[Tuple[str, str, Tuple[str, ...]], Any] = {}
+        # Bumped whenever loaded data is replaced, so callers can key caches on it
+        self.version = 0
+        # Guards the frame swap, the version bump and _derived against concurrent refreshes
+        self._lock = threading.Lock()
         base_dir = self._app_cfg.get("dataset_cache_dir", "../data")
         self._data_dir = (Path(__file__).resolve().parent.parent / base_dir).resolve()
         self._data_dir.mkdir(parents=True, exist_ok=True)
@@ -46,11 +59,71 @@ class DataManager:
         if df is None:
             df = self._load_local_sample(cfg)
 
-        self._cache[name] = df
+        df = self._prepare_columns(df)
+        with self._lock:
+            if name in self._cache:
+                self.version += 1
+            self._cache[name] = df
+            self._derived = {key: value for key, value in self._derived.items() if key[0] != name}
         return df
 
+    def _load_derived(
+        self, name: str, key: Tuple[str, str, Tuple[str, ...]], build: Callable[[pd.DataFrame], Any]
+    ) -> Any:
+        """Return the derived structure under `key`, building it from dataset `name` if missing.
+
+        The build runs outside the lock; its result is only stored if the dataset it
+        was built from is still the cached one, so a view of a replaced frame is never
+        served under the new version.
+        """
+        with self._lock:
+            value = self._derived.get(key)
+        if value is not None:
+            return value
+        df = self.load_dataset(name)
+        value = build(df)
+        with self._lock:
+            if self._cache.get(name) is df:
+                value = self._derived.setdefault(key, value)
+        return value
+
+    def load_indexed(self, name: str, keys: Tuple[str, ...]) -> pd.DataFrame:
+        """Return the dataset indexed by `keys` and sorted, so `.loc` lookups avoid full scans.
+
+        Key columns are kept as regular columns too. Views are built lazily and
+        dropped whenever the underlying dataset is reloaded.
+        """
+        return self._load_derived(
+            name, (name, "indexed", keys), lambda df: df.set_index(list(keys), drop=False).sort_index()
+        )
+
+    def load_years(self, name: str, keys: Tuple[str, ...]) -> Dict[Any, Tuple[int, ...]]:
+        """Map each `keys` label (a tuple when several keys) to its years, newest first.
+
+        Built lazily and dropped whenever the underlying dataset is reloaded.
+        """
+        def build(df: pd.DataFrame) -> Dict[Any, Tuple[int, ...]]:
+            by_label = df.groupby(list(keys) if len(keys) > 1 else keys[0], observed=True)["year"].unique()
+            return {label: tuple(sorted(values.tolist(), reverse=True)) for label, values in by_label.items()}
+
+        return self._load_derived(name, (name, "years", keys), build)
+
+    def load_state_year_means(self, name: str, column: str) -> pd.Series:
+        """Mean of `column` per (state, year) as a sorted MultiIndex series.
+
+        Built lazily and dropped whenever the underlying dataset is reloaded.
+        """
+        return self._load_derived(
+            name,
+            (name, "state_year_means", (column,)),
+            lambda df: df.groupby(["state", "year"], observed=True)[column].mean(),
+        )
+
     def reload_all(self) -> Dict[str, pd.DataFrame]:
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._derived.clear()
+            self.version += 1
         for dataset_name in self._datasets:
             self.load_dataset(dataset_name, force_refresh=True)
         return self._cache
@@ -109,3 +182,22 @@ class DataManager:
     def _normalise_columns(df: pd.DataFrame) -> pd.DataFrame:
         df.columns = [col.strip().lower() for col in df.columns]
         return df
+
+    @staticmethod
+    def _prepare_columns(df: pd.DataFrame) -> pd.DataFrame:
+        # Lowercased copy of crop names so substring filters skip per-query case folding
+        if "crop" in df.columns:
+            df["crop_lower"] = df["crop"].str.lower()
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+        return df
+
+    @staticmethod
+    def source_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Copy of a loaded dataset in its source schema, undoing _prepare_columns."""
+        df = df.drop(columns=[col for col in DERIVED_COLUMNS if col in df.columns])
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(object)
+        return df
@@ -6,7 +6,9 @@ This implements the OBSERVER PATTERN and PUB/SUB architecture:
 - Subscribers listen to specific topics
 - Decouples event producers from consumers
 """
-from typing import Dict, List, Callable, Any
+from collections import deque
+from functools import wraps
+from typing import Awaitable, Deque, Dict, List, Callable, Any, Sequence
 import logging
 from dataclasses import dataclass
 from datetime import datetime
@@ -37,6 +39,32 @@ class Event:
             self.metadata = {}
 
 
+def _wrap_handler(topic: str, handler: Callable[[Event], None]) -> Callable[[Event], None]:
+    """Wrap a handler once at subscribe time so publish needs no per-call try block."""
+    @wraps(handler)
+    def wrapped(event: Event):
+        try:
+            handler(event)
+        except Exception as e:
+            logger.error("Error in handler %s for topic '%s': %s", handler.__name__, topic, e)
+            raise
+    return wrapped
+
+
+def _wrap_async_handler(
+    topic: str, handler: Callable[[Event], Awaitable[None]]
+) -> Callable[[Event], Awaitable[None]]:
+    """Coroutine counterpart of _wrap_handler."""
+    @wraps(handler)
+    async def wrapped(event: Event):
+        try:
+            await handler(event)
+        except Exception as e:
+            logger.error("Error in handler %s for topic '%s': %s", handler.__name__, topic, e)
+            raise
+    return wrapped
+
+
 class EventBus:
     """
     Central event bus for publish/subscribe communication.
@@ -46,12 +74,16 @@ class EventBus:
     - Data loader subscribes to 'query.parsed' and publishes 'data.loaded'
     - Analyzer subscribes to 'data.loaded' and publishes 'analysis.complete'
     - Formatter subscribes to 'analysis.complete' and returns final result
+
+    Handlers registered with subscribe_async() are coroutines and only run
+    when the event is published with publish_async().
     """
 
     def __init__(self):
         self._subscribers: Dict[str, List[Callable]] = {}
-        self._event_history: List[Event] = []
-        self._max_history = 100  # Keep last 100 events for debugging
+        self._async_subscribers: Dict[str, List[Callable]] = {}
+        # Bounded deque drops the oldest event in O(1) once full
+        self._event_history: Deque[Event] = deque(maxlen=100)  # Keep last 100 events for debugging
 
     def subscribe(self, topic: str, handler: Callable[[Event], None]):
         """
@@ -64,8 +96,24 @@ class EventBus:
         if topic not in self._subscribers:
             self._subscribers[topic] = []
 
-        self._subscribers[topic].append(handler)
-        logger.debug(f"Subscribed handler {handler.__name__} to topic '{topic}'")
+        self._subscribers[topic].append(_wrap_handler(topic, handler))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Subscribed handler {handler.__name__} to topic '{topic}'")
+
+    def subscribe_async(self, topic: str, handler: Callable[[Event], Awaitable[None]]):
+        """
+        Subscribe a coroutine handler to events of a specific topic.
+
+        Args:
+            topic: Event topic to listen for (e.g., 'query.parsed')
+            handler: Coroutine function to await when event is published
+        """
+        if topic not in self._async_subscribers:
+            self._async_subscribers[topic] = []
+
+        self._async_subscribers[topic].append(_wrap_async_handler(topic, handler))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Subscribed async handler {handler.__name__} to topic '{topic}'")
 
     def publish(self, topic: str, data: Any, metadata: Dict[str, Any] = None):
         """
@@ -80,22 +128,46 @@ class EventBus:
 
         # Store in history
         self._event_history.append(event)
-        if len(self._event_history) > self._max_history:
-            self._event_history.pop(0)
-
-        # Notify subscribers
-        if topic in self._subscribers:
-            logger.debug(f"Publishing event '{topic}' to {len(self._subscribers[topic])} subscribers")
-            for handler in self._subscribers[topic]:
-                try:
-                    handler(event)
-                except Exception as e:
-                    logger.error(f"Error in handler {handler.__name__} for topic '{topic}': {e}")
-                    raise
+
+        # Notify subscribers (single lookup; skip log formatting unless DEBUG is on)
+        handlers = self._subscribers.get(topic)
+        if handlers is not None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Publishing event '{topic}' to {len(handlers)} subscribers")
+            for handler in handlers:
+                handler(event)
         else:
-            logger.warning(f"No subscribers for topic '{topic}'")
+            logger.warning("No subscribers for topic '%s'", topic)
+
+    async def publish_async(self, topic: str, data: Any, metadata: Dict[str, Any] = None):
+        """
+        Publish an event, awaiting async subscribers and calling sync ones directly.
+
+        Args:
+            topic: Event topic (e.g., 'data.loaded')
+            data: Event payload
+            metadata: Additional context
+        """
+        event = Event(topic=topic, data=data, metadata=metadata or {})
+
+        # Store in history
+        self._event_history.append(event)
 
-    def get_event_history(self, topic: str = None) -> List[Event]:
+        handlers = self._subscribers.get(topic)
+        async_handlers = self._async_subscribers.get(topic)
+        if handlers is None and async_handlers is None:
+            logger.warning("No subscribers for topic '%s'", topic)
+            return
+
+        if logger.isEnabledFor(logging.DEBUG):
+            count = len(handlers or ()) + len(async_handlers or ())
+            logger.debug(f"Publishing event '{topic}' to {count} subscribers")
+        for handler in handlers or ():
+            handler(event)
+        for handler in async_handlers or ():
+            await handler(event)
+
+    def get_event_history(self, topic: str = None) -> Sequence[Event]:
         """
         Get event history, optionally filtered by topic.
 
@@ -103,15 +175,16 @@ class EventBus:
             topic: Optional topic to filter by
 
         Returns:
-            List of events
+            Read-only snapshot (tuple) of events
         """
         if topic:
-            return [e for e in self._event_history if e.topic == topic]
-        return self._event_history.copy()
+            return tuple(e for e in self._event_history if e.topic == topic)
+        return tuple(self._event_history)
 
     def clear_subscribers(self):
         """Clear all subscriptions (useful for testing)."""
         self._subscribers.clear()
+        self._async_subscribers.clear()
         logger.debug("Cleared all subscribers")
 
 
@@ -43,7 +43,7 @@ def ingest(datasets: Iterable[str], fmt: str, output: Path, force_refresh: bool)
             print(f"[ingest] Warning: dataset '{name}' returned no rows.")
             continue
         dest = output / f"{name}"
-        result_path = _write_snapshot(df, dest, fmt)
+        result_path = _write_snapshot(DataManager.source_frame(df), dest, fmt)
         print(f"[ingest] Snapshot written to {result_path}")
 
 
@@ -1,13 +1,19 @@
 import asyncio
 import logging
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from typing import Iterator
+
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from .config import load_config
 from .data_manager import DataManager
+from .event_bus import event_bus
 from .question_parser import parse_question
-from .query_executor import QueryExecutor
+from .query_executor import QueryExecutor, question_key
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +29,28 @@ class AskResponse(BaseModel):
     debug: dict | None = None
 
 
-app = FastAPI(title="Project Samarth Prototype", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the data manager and pipeline at startup, loading both datasets concurrently."""
+    app.state.config = load_config()
+    app.state.data_manager = DataManager(app.state.config)
+    await asyncio.gather(
+        asyncio.to_thread(app.state.data_manager.load_dataset, "agriculture"),
+        asyncio.to_thread(app.state.data_manager.load_dataset, "rainfall"),
+    )
+    app.state.executor = QueryExecutor(parse_question, app.state.data_manager)
+    yield
+    app.state.executor.close()
+    # Stages subscribe to the global bus; drop them so a restarted app doesn't register twice
+    event_bus.clear_subscribers()
+
+
+app = FastAPI(
+    title="Project Samarth Prototype",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson serializes the table payloads much faster than json
+)
 
 # Configure CORS - allow all origins for public API (including Netlify frontend)
 app.add_middleware(
@@ -41,9 +68,65 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
-config = load_config()
-data_manager = DataManager(config)
-executor = QueryExecutor(parse_question, data_manager)
+# Tasks for questions currently executing, keyed like the executor's response cache
+# so concurrent duplicates (up to case and padding) share one run
+_inflight: dict[str, asyncio.Task] = {}
+
+
+def _forget_inflight(key: str, task: asyncio.Task) -> None:
+    """Drop a finished shared run, marking its error retrieved in case every caller left."""
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()
+
+
+async def _execute_once(executor: QueryExecutor, question: str) -> dict:
+    """
+    Run the pipeline for `question`, coalescing concurrent requests for the same question.
+
+    The run is its own task and every caller, the first included, awaits it through
+    asyncio.shield, so a disconnecting client never cancels the run the others share.
+    Completed results are cached by the executor, keyed on the data version.
+    """
+    key = question_key(question)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(executor.execute_query(question))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _forget_inflight(key, done))
+    return await asyncio.shield(task)
+
+
+def _iter_ndjson(result: dict) -> Iterator[bytes]:
+    """
+    Yield a response as NDJSON: the answer first, then each table header and its rows.
+
+    Each line is serialized only when the response body asks for it, so the answer
+    goes out before the tables are encoded and no full body is ever held in memory.
+    """
+    yield orjson.dumps({
+        "type": "answer",
+        "answer": result["answer"],
+        "citations": result["citations"],
+        "debug": result.get("debug"),
+    }) + b"\n"
+    for index, table in enumerate(result["tables"]):
+        yield orjson.dumps({
+            "type": "table",
+            "table": index,
+            "title": table["title"],
+            "headers": table["headers"],
+        }) + b"\n"
+        for row in table["rows"]:
+            yield orjson.dumps({"type": "row", "table": index, "row": row}) + b"\n"
+
+
+def _respond(result: dict, request: Request):
+    """Stream NDJSON when the client asks for it, otherwise return the regular JSON body."""
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(_iter_ndjson(result), media_type="application/x-ndjson")
+    return AskResponse(**result)
 
 
 @app.get("/")
@@ -58,20 +141,20 @@ def health():
 
 
 @app.post("/ask", response_model=AskResponse)
-async def ask(payload: AskRequest):
+async def ask(payload: AskRequest, request: Request):
     """
-    Process a natural language question using the event-driven pipeline.
-
-    The QueryExecutor orchestrates the entire pipeline through events:
-    1. question.received -> Parse Stage
-    2. query.parsed -> Data Stage
-    3. data.loaded -> Analysis Stage
-    4. analysis.complete -> Format Stage
-    5. response.ready -> Return to user
+    Process a natural language question through the query pipeline.
+
+    The QueryExecutor runs Parse -> Data -> Analysis -> Format inline on its worker
+    thread pool, checking the query deadline between stages. Responses are cached per
+    normalized question and data version, and concurrent duplicates share one run.
+
+    Clients sending ``Accept: application/x-ndjson`` get the response streamed as
+    newline-delimited JSON instead (see ``_iter_ndjson``).
     """
     try:
-        result = await executor.execute_query(payload.question)
-        return AskResponse(**result)
+        result = await _execute_once(request.app.state.executor, payload.question)
+        return _respond(result, request)
     except asyncio.TimeoutError:
         logger.error("Query timed out after 30 seconds")
         raise HTTPException(
@@ -90,8 +173,9 @@ async def ask(payload: AskRequest):
 
 
 @app.post("/refresh")
-def refresh():
+def refresh(request: Request):
     """Refresh data from data.gov.in API."""
+    data_manager = request.app.state.data_manager
     data_manager.load_dataset("agriculture", force_refresh=True)
     data_manager.load_dataset("rainfall", force_refresh=True)
     return {"status": "reloaded"}
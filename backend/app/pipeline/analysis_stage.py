@@ -14,6 +14,37 @@ from .base_stage import PipelineStage
 logger = logging.getLogger(__name__)
 
 
+def _rows_for(view: pd.DataFrame, *keys) -> pd.DataFrame:
+    """Rows of a sorted indexed view matching any of `keys`; empty frame when none match."""
+    present = [key for key in dict.fromkeys(keys) if key in view.index]
+    if not present:
+        return view.iloc[:0].reset_index(drop=True)
+    return view.loc[present].reset_index(drop=True)
+
+
+def _pearson(x: np.ndarray, y: np.ndarray) -> float:
+    """Pearson correlation over pairs where both values are present; NaN if undefined."""
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if valid.sum() < 2:
+        return np.nan
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return float(np.corrcoef(x[valid], y[valid])[0, 1])
+
+
+def _columns(df: pd.DataFrame, names) -> Dict[str, np.ndarray]:
+    """Column arrays of `df`; results are handed to FormatStage in this columnar form."""
+    return {name: df[name].to_numpy() for name in names}
+
+
+def _fast_isin(col: pd.Series, values) -> np.ndarray:
+    """Boolean mask of `col` in `values`, comparing category codes when `col` is categorical."""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        categories = col.cat.categories
+        codes = [categories.get_loc(value) for value in values if value in categories]
+        return np.isin(col.cat.codes.to_numpy(), codes)
+    return col.isin(values).to_numpy()
+
+
 class AnalysisStage(PipelineStage):
     """
     Analyzes data based on query intent.
@@ -73,54 +104,68 @@ class AnalysisStage(PipelineStage):
         crop_filter = params.get("crop_filter")
         top_m = params.get("top_m", 3)
 
-        rainfall_df = datasets["rainfall"]
-        agri_df = datasets["agriculture"]
-
-        # Filter rainfall data
-        rainfall = rainfall_df[rainfall_df["state"].isin([state_a, state_b])]
-        available_years = sorted(rainfall["year"].unique(), reverse=True)
+        rainfall_years = datasets["rainfall_years_by_state"]
+        available_years = sorted(
+            set(rainfall_years.get(state_a, ())) | set(rainfall_years.get(state_b, ())),
+            reverse=True
+        )
         n_years = last_n_years if last_n_years else min(len(available_years), 5)
         years_sel = sorted(available_years[:n_years])
 
-        rainfall_subset = rainfall[rainfall["year"].isin(years_sel)]
+        # Look up the precomputed (state, year) means, ordered by year then state
+        states = list(dict.fromkeys([state_a, state_b]))
+        wanted = pd.MultiIndex.from_tuples(
+            [(state, year) for year in years_sel for state in states], names=["state", "year"]
+        )
         rainfall_stats = (
-            rainfall_subset.groupby(["state", "year"])["annual_rainfall_mm"]
-            .mean()
+            datasets["rainfall_means_by_state_year"]
+            .reindex(wanted)
+            .dropna()
             .reset_index()
-            .sort_values(["year", "state"])
         )
 
+        # Split into per-state (years, mm) arrays, already in ascending year order
+        rainfall_states = rainfall_stats["state"].to_numpy()
+        rainfall_year_values = rainfall_stats["year"].to_numpy(dtype=np.int64)
+        rainfall_mm = rainfall_stats["annual_rainfall_mm"].to_numpy(dtype=np.float64)
+        rainfall_by_state = {}
+        for state in states:
+            mask = rainfall_states == state
+            rainfall_by_state[state] = (rainfall_year_values[mask], rainfall_mm[mask])
+
         # Calculate averages
-        avg_a = rainfall_subset[rainfall_subset["state"] == state_a]["annual_rainfall_mm"].mean()
-        avg_b = rainfall_subset[rainfall_subset["state"] == state_b]["annual_rainfall_mm"].mean()
+        avg_a = rainfall_stats["annual_rainfall_mm"][rainfall_states == state_a].mean()
+        avg_b = rainfall_stats["annual_rainfall_mm"][rainfall_states == state_b].mean()
 
         # Filter agriculture data
-        agri_subset = agri_df[agri_df["state"].isin([state_a, state_b])]
+        agri_subset = _rows_for(datasets["agriculture_by_state_crop"], state_a, state_b)
         agri_subset = agri_subset[agri_subset["year"].isin(years_sel)]
 
         if crop_filter:
-            agri_subset = agri_subset[agri_subset["crop"].str.contains(crop_filter, case=False, na=False)]
-
-        # Rank crops
-        crop_rankings = (
-            agri_subset.groupby(["state", "crop"])["production_tonnes"]
-            .sum()
-            .reset_index()
-        )
-        crop_rankings["rank"] = crop_rankings.groupby("state")["production_tonnes"].rank(
-            method="first", ascending=False
-        )
-        crop_rankings = crop_rankings[crop_rankings["rank"] <= top_m]
-        crop_rankings = crop_rankings.sort_values(["state", "rank"])
+            agri_subset = agri_subset[
+                agri_subset["crop_lower"].str.contains(crop_filter.lower(), regex=False, na=False)
+            ]
+
+        # Rank crops: keep only the top_m per state instead of ranking every row
+        grouped = agri_subset.groupby(["state", "crop"], observed=True)["production_tonnes"].sum()
+        if grouped.empty:
+            crop_rankings = grouped.reset_index()
+        else:
+            crop_rankings = (
+                grouped.groupby(level="state", group_keys=False, observed=True)
+                .nlargest(top_m)
+                .reset_index()
+            )
+        crop_rankings["rank"] = crop_rankings.groupby("state", observed=True).cumcount() + 1
 
         return {
             "state_a": state_a,
             "state_b": state_b,
             "years": years_sel,
-            "rainfall_stats": rainfall_stats,
+            "rainfall_by_state": rainfall_by_state,
             "avg_rainfall_a": avg_a,
             "avg_rainfall_b": avg_b,
-            "crop_rankings": crop_rankings,
+            "crop_rankings": _columns(crop_rankings, ("state", "crop", "production_tonnes", "rank")),
             "crop_filter": crop_filter,
             "top_m": top_m
         }
@@ -138,12 +183,12 @@ class AnalysisStage(PipelineStage):
         if not crop:
             raise ValueError(f"Missing required parameter: 'crop'")
 
-        agri_df = datasets["agriculture"]
+        agri_by_crop_year = datasets["agriculture_by_crop_year"]
 
         # Filter by crop
-        subset = agri_df[agri_df["crop"] == crop]
+        crop_rows = _rows_for(agri_by_crop_year, crop)
 
-        if subset.empty:
+        if crop_rows.empty:
             raise ValueError(
                 f"No production data found for crop '{crop}' in the dataset. "
                 f"Please check if the crop name is correct."
@@ -151,20 +196,22 @@ class AnalysisStage(PipelineStage):
 
         # Determine year
         if year:
-            subset = subset[subset["year"] == year]
+            subset = _rows_for(agri_by_crop_year, (crop, year))
             if subset.empty:
                 raise ValueError(
                     f"No production data found for crop '{crop}' in year {year}. "
-                    f"Available years: {sorted(agri_df[agri_df['crop'] == crop]['year'].unique())}"
+                    f"Available years: {sorted(crop_rows['year'].unique())}"
                 )
         else:
-            latest_year = subset["year"].max()
+            crop_years = crop_rows["year"].values
+            latest_year = crop_years.max()
             year = latest_year
-            subset = subset[subset["year"] == year]
+            subset = crop_rows[crop_years == year]
 
-        # Get data for each state
-        state_a_rows = subset[subset["state"] == state_a]
-        state_b_rows = subset[subset["state"] == state_b]
+        # Get data for each state (plain ndarray compares skip index alignment)
+        states = subset["state"].values
+        state_a_rows = subset[states == state_a]
+        state_b_rows = subset[states == state_b]
         
         # If both states have no data, raise error; otherwise continue with partial results
         if state_a_rows.empty and state_b_rows.empty:
@@ -184,7 +231,8 @@ class AnalysisStage(PipelineStage):
             result["state_a_max"] = None
             logger.warning(f"No data found for {crop} in {state_a} for year {year}")
         else:
-            max_row = state_a_rows.loc[state_a_rows["production_tonnes"].idxmax()]
+            max_pos = int(np.nanargmax(state_a_rows["production_tonnes"].to_numpy()))
+            max_row = state_a_rows.iloc[max_pos]
             result["state_a_max"] = {
                 "district": max_row["district"],
                 "production": float(max_row["production_tonnes"])
@@ -195,7 +243,8 @@ class AnalysisStage(PipelineStage):
             result["state_b_min"] = None
             logger.warning(f"No data found for {crop} in {state_b} for year {year}")
         else:
-            min_row = state_b_rows.loc[state_b_rows["production_tonnes"].idxmin()]
+            min_pos = int(np.nanargmin(state_b_rows["production_tonnes"].to_numpy()))
+            min_row = state_b_rows.iloc[min_pos]
             result["state_b_min"] = {
                 "district": min_row["district"],
                 "production": float(min_row["production_tonnes"])
@@ -216,23 +265,20 @@ class AnalysisStage(PipelineStage):
         
         n_years = params.get("years", 10)
 
-        agri_df = datasets["agriculture"]
-        rainfall_df = datasets["rainfall"]
-
         # Filter data
-        agri = agri_df[(agri_df["state"] == state) & (agri_df["crop"] == crop)]
+        agri = _rows_for(datasets["agriculture_by_state_crop"], (state, crop))
         if agri.empty:
             raise ValueError(
                 f"No production data found for crop '{crop}' in state '{state}'. "
                 f"Please verify the crop name and state are correct."
             )
 
-        rainfall = rainfall_df[rainfall_df["state"] == state]
+        rainfall = _rows_for(datasets["rainfall_by_state"], state)
         if rainfall.empty:
             raise ValueError("No rainfall data found for the selected region.")
 
         # Select years
-        years_available = sorted(agri["year"].unique(), reverse=True)
+        years_available = datasets["agriculture_years_by_state_crop"].get((state, crop), ())
         years_to_use = n_years if n_years else min(len(years_available), 10)
         years_sel = sorted(years_available[:years_to_use])
 
@@ -244,14 +290,18 @@ class AnalysisStage(PipelineStage):
             agri.groupby("year")["production_tonnes"]
             .sum()
             .reset_index()
-            .sort_values("year")
         )
 
         rainfall_series = rainfall.sort_values("year")[["year", "annual_rainfall_mm"]]
 
-        # Merge and calculate correlation
+        # Merge and hand the columns on as arrays so formatting never touches pandas
         merged = pd.merge(production_series, rainfall_series, on="year", how="inner")
-        corr = merged["production_tonnes"].corr(merged["annual_rainfall_mm"])
+        merged_arrays = {
+            "year": merged["year"].to_numpy(dtype=np.int64),
+            "production": merged["production_tonnes"].to_numpy(dtype=np.float64),
+            "rainfall": merged["annual_rainfall_mm"].to_numpy(dtype=np.float64),
+        }
+        corr = _pearson(merged_arrays["production"], merged_arrays["rainfall"])
 
         # Calculate growth trend
         trend_pct = self._calc_growth(production_series)
@@ -260,7 +310,7 @@ class AnalysisStage(PipelineStage):
             "state": state,
             "crop": crop,
             "years": years_sel,
-            "merged_data": merged,
+            "merged_arrays": merged_arrays,
             "correlation": corr,
             "trend_pct": trend_pct
         }
@@ -288,41 +338,47 @@ class AnalysisStage(PipelineStage):
         
         n_years = params.get("years", 5)
 
-        agri_df = datasets["agriculture"]
-        rainfall_df = datasets["rainfall"]
-
         # Filter agriculture data
-        relevant = agri_df[agri_df["state"] == state]
-        years_available = sorted(relevant["year"].unique(), reverse=True)
+        relevant = _rows_for(datasets["agriculture_by_state_crop"], state)
+        years_available = datasets["agriculture_years_by_state"].get(state, ())
         years_to_use = n_years if n_years else min(len(years_available), 5)
         years_sel = sorted(years_available[:years_to_use])
 
-        subset = relevant[relevant["year"].isin(years_sel)]
+        subset = relevant[
+            relevant["year"].isin(years_sel).to_numpy()
+            & _fast_isin(relevant["crop"], [current_crop, proposed_crop])
+        ]
 
-        # Aggregate data for both crops
+        # Aggregate both crops into one crop x year table
         agg = (
-            subset[subset["crop"].isin([current_crop, proposed_crop])]
-            .groupby(["crop", "year"])["production_tonnes"]
+            subset.groupby(["crop", "year"], observed=True)["production_tonnes"]
             .sum()
-            .reset_index()
+            .unstack("year")
         )
 
         # Get rainfall data
-        rainfall = (
-            rainfall_df[(rainfall_df["state"] == state) & (rainfall_df["year"].isin(years_sel))]
-            .sort_values("year")
-        )
+        rainfall = _rows_for(datasets["rainfall_by_state"], state)
+        rainfall = rainfall[rainfall["year"].isin(years_sel)].sort_values("year")
+
+        # Growth (first to last reported year) and mean for every crop at once
+        if not agg.empty:
+            first = agg.bfill(axis=1).iloc[:, 0]
+            last = agg.ffill(axis=1).iloc[:, -1]
+            has_growth = (agg.count(axis=1) >= 2) & (first != 0)
+            growth = ((last - first) / first * 100.0).where(has_growth, 0.0)
+            avg_prod = agg.mean(axis=1)
 
         crop_data = {}
         for crop in [current_crop, proposed_crop]:
-            crop_series = agg[agg["crop"] == crop].sort_values("year")
-            if not crop_series.empty:
-                growth = self._calc_growth(crop_series)
-                avg_prod = crop_series["production_tonnes"].mean()
+            if crop in agg.index:
+                crop_series = agg.loc[crop].dropna()
                 crop_data[crop] = {
-                    "series": crop_series,
-                    "growth": growth,
-                    "avg_production": avg_prod
+                    "series": {
+                        "year": crop_series.index.to_numpy(dtype=np.int64),
+                        "production_tonnes": crop_series.to_numpy(dtype=np.float64),
+                    },
+                    "growth": growth[crop],
+                    "avg_production": avg_prod[crop]
                 }
             else:
                 crop_data[crop] = None
@@ -333,7 +389,7 @@ class AnalysisStage(PipelineStage):
             avg_rain = rainfall["annual_rainfall_mm"].mean()
             rain_trend = self._calc_growth(rainfall)
             rainfall_stats = {
-                "data": rainfall,
+                "data": _columns(rainfall, ("year", "annual_rainfall_mm")),
                 "avg_rainfall": avg_rain,
                 "trend": rain_trend
             }
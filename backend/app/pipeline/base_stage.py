@@ -5,6 +5,8 @@ This is the TEMPLATE METHOD PATTERN:
 - Base class defines the workflow
 - Subclasses implement specific processing logic
 """
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from typing import Any
 import logging
@@ -18,7 +20,7 @@ class PipelineStage(ABC):
     Base class for all pipeline stages.
 
     Each stage:
-    1. Subscribes to an input topic
+    1. Subscribes to an input topic (once subscribe() is called)
     2. Processes the event data
     3. Publishes result to an output topic
     """
@@ -31,30 +33,55 @@ class PipelineStage(ABC):
             event_bus: The event bus to subscribe/publish to
         """
         self.event_bus = event_bus
-        self._register()
 
-    def _register(self):
-        """Register this stage with the event bus."""
+    def subscribe(self):
+        """
+        Register this stage with the event bus.
+
+        Only the pipelined executor calls this; inline runs go through run() and
+        must not be re-triggered by stray events on the shared bus.
+        """
         input_topic = self.input_topic()
-        self.event_bus.subscribe(input_topic, self._handle_event)
-        logger.info(f"{self.__class__.__name__} registered for topic '{input_topic}'")
+        self.event_bus.subscribe_async(input_topic, self._handle_event_async)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"{self.__class__.__name__} registered for topic '{input_topic}'")
 
-    def _handle_event(self, event: Event):
+    def run(self, data: Any, metadata: dict) -> Any:
+        """
+        Check the query deadline, then process the data.
+
+        The deadline is a time.monotonic() value carried in metadata; checking it
+        at each stage boundary replaces a per-query timer.
+
+        Raises:
+            asyncio.TimeoutError: If the deadline has already passed
+        """
+        deadline = metadata.get("deadline")
+        if deadline is not None and time.monotonic() > deadline:
+            raise asyncio.TimeoutError(f"Query deadline passed before {self.__class__.__name__}")
+        return self.process(data, metadata)
+
+    async def _handle_event_async(self, event: Event):
         """
         Internal event handler that calls process() and publishes result.
 
+        process() runs in a worker thread so pandas work does not block
+        the event loop serving other requests.
+
         Args:
             event: Incoming event
         """
-        logger.debug(f"{self.__class__.__name__} processing event from '{event.topic}'")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"{self.__class__.__name__} processing event from '{event.topic}'")
 
         try:
             # Process the event data
-            result = self.process(event.data, event.metadata)
+            result = await asyncio.to_thread(self.run, event.data, event.metadata)
 
             # Publish to next stage
             output_topic = self.output_topic()
-            self.event_bus.publish(
+            await self.event_bus.publish_async(
                 topic=output_topic,
                 data=result,
                 metadata={
@@ -62,14 +89,15 @@ class PipelineStage(ABC):
                     "processed_by": self.__class__.__name__
                 }
             )
-            logger.debug(f"{self.__class__.__name__} published to '{output_topic}'")
+            if debug:
+                logger.debug(f"{self.__class__.__name__} published to '{output_topic}'")
 
         except Exception as e:
-            logger.error(f"{self.__class__.__name__} failed: {e}")
+            logger.error("%s failed: %s", self.__class__.__name__, e)
             # Publish error event
-            self.event_bus.publish(
+            await self.event_bus.publish_async(
                 topic="pipeline.error",
-                data={"error": str(e), "stage": self.__class__.__name__},
+                data={"error": str(e), "error_type": type(e), "stage": self.__class__.__name__},
                 metadata=event.metadata
             )
             raise
@@ -12,6 +12,28 @@ from ..data_manager import DataManager
 
 logger = logging.getLogger(__name__)
 
+# Datasets each intent's analysis reads; unknown intents load nothing
+INTENT_DATASETS = {
+    "compare_rainfall_and_crops": ("agriculture", "rainfall"),
+    "district_extremes": ("agriculture",),
+    "production_trend_with_climate": ("agriculture", "rainfall"),
+    "policy_arguments": ("agriculture", "rainfall"),
+}
+
+# Sorted, indexed views handed to the analysis stage alongside the raw frames
+INDEXED_VIEWS = {
+    "agriculture_by_state_crop": ("agriculture", ("state", "crop")),
+    "agriculture_by_crop_year": ("agriculture", ("crop", "year")),
+    "rainfall_by_state": ("rainfall", ("state",)),
+}
+
+# Per-label year lists (newest first), so analysis skips unique() + sort per query
+YEAR_LOOKUPS = {
+    "agriculture_years_by_state": ("agriculture", ("state",)),
+    "agriculture_years_by_state_crop": ("agriculture", ("state", "crop")),
+    "rainfall_years_by_state": ("rainfall", ("state",)),
+}
+
 
 class DataLoadStage(PipelineStage):
     """
@@ -52,17 +74,26 @@ class DataLoadStage(PipelineStage):
         """
         logger.info("Loading datasets for query")
 
-        # Load both datasets (in real system, could be selective based on intent)
-        agriculture_data = self.data_manager.load_dataset("agriculture")
-        rainfall_data = self.data_manager.load_dataset("rainfall")
+        # Only load what the intent's analysis needs
+        needed = INTENT_DATASETS.get(data["intent"], ())
+        datasets = {name: self.data_manager.load_dataset(name) for name in needed}
+        for view_name, (dataset_name, keys) in INDEXED_VIEWS.items():
+            if dataset_name in needed:
+                datasets[view_name] = self.data_manager.load_indexed(dataset_name, keys)
+        for lookup_name, (dataset_name, keys) in YEAR_LOOKUPS.items():
+            if dataset_name in needed:
+                datasets[lookup_name] = self.data_manager.load_years(dataset_name, keys)
+        if "rainfall" in needed:
+            datasets["rainfall_means_by_state_year"] = self.data_manager.load_state_year_means(
+                "rainfall", "annual_rainfall_mm"
+            )
 
         result = {
             **data,  # Pass along the parsed data
-            "datasets": {
-                "agriculture": agriculture_data,
-                "rainfall": rainfall_data
-            }
+            "datasets": datasets
         }
 
-        logger.debug(f"Loaded {len(agriculture_data)} agriculture records, {len(rainfall_data)} rainfall records")
+        if logger.isEnabledFor(logging.DEBUG):
+            counts = ", ".join(f"{len(datasets[name])} {name}" for name in needed)
+            logger.debug(f"Loaded {counts or 'no'} records")
         return result
@@ -7,11 +7,75 @@ Output: Formatted response with answer, tables, and citations
 """
 from typing import Any, Dict, List
 import logging
+import math
 import numpy as np
 from .base_stage import PipelineStage
 
 logger = logging.getLogger(__name__)
 
+# Source citations are identical for every response, so build them once
+_CITATION_RAINFALL = {
+    "dataset": "rainfall",
+    "source": "https://data.gov.in/resources/rainfall-sub-division-wise-distribution",
+    "resource_id": "cca5f77c-68b3-43df-bd01-beb3b69204ed"
+}
+_CITATION_AGRICULTURE = {
+    "dataset": "agriculture",
+    "source": "https://data.gov.in/resources/district-wise-crop-production-statistics",
+    "resource_id": "9ef84268-d588-465a-a308-a864a43d0070"
+}
+_CITATIONS_RAINFALL_FIRST = (_CITATION_RAINFALL, _CITATION_AGRICULTURE)
+_CITATIONS_AGRICULTURE_FIRST = (_CITATION_AGRICULTURE, _CITATION_RAINFALL)
+_CITATIONS_AGRICULTURE_ONLY = (_CITATION_AGRICULTURE,)
+
+# (strength level, is positive) -> correlation wording; level counts the 0.4 and 0.7 thresholds met
+_INTERP = {
+    (0, 0): "weak negative association",
+    (0, 1): "weak positive association",
+    (1, 0): "moderate negative association",
+    (1, 1): "moderate positive association",
+    (2, 0): "strong negative association",
+    (2, 1): "strong positive association",
+}
+
+# (column, kind, ndigits) row layouts for _column_rows
+_CROP_ROW_SPECS = (("state", "str", None), ("crop", "str", None), ("production_tonnes", "float", 2))
+_TREND_ROW_SPECS = (("year", "int", None), ("production", "float", 2), ("rainfall", "float", 1))
+_PRODUCTION_ROW_SPECS = (("year", "int", None), ("production_tonnes", "float", 2))
+_RAINFALL_ROW_SPECS = (("year", "int", None), ("annual_rainfall_mm", "float", 1))
+
+
+def _rainfall_column(state_years: np.ndarray, rainfall_mm: np.ndarray, years: np.ndarray) -> List:
+    """Rainfall for each of `years` from one state's sorted year/mm arrays; None where missing."""
+    if len(state_years) == 0:
+        return [None] * len(years)
+    idx = np.minimum(np.searchsorted(state_years, years), len(state_years) - 1)
+    found = (state_years[idx] == years).tolist()
+    rounded = np.round(rainfall_mm[idx], 1).tolist()
+    return [value if present else None for value, present in zip(rounded, found)]
+
+
+def _column_rows(columns, specs) -> List[List]:
+    """
+    Build table rows from column arrays.
+
+    Args:
+        columns: Mapping of column name to array (a dict of ndarrays or a DataFrame)
+        specs: (column, kind, ndigits) per output cell; kind is "int", "float" or "str"
+
+    Returns:
+        List of rows of native Python values, ready to serialize
+    """
+    cells = []
+    for name, kind, ndigits in specs:
+        values = np.asarray(columns[name])
+        if kind == "int":
+            values = values.astype(np.int64)
+        elif kind == "float":
+            values = np.round(values.astype(np.float64), ndigits)
+        cells.append(values.tolist())
+    return [list(row) for row in zip(*cells)]
+
 
 class FormatStage(PipelineStage):
     """
@@ -44,19 +108,13 @@ class FormatStage(PipelineStage):
         intent = data["intent"]
         results = data["results"]
 
-        logger.info(f"Formatting results for intent: {intent}")
+        logger.info("Formatting results for intent: %s", intent)
 
         # Route to appropriate formatter
-        if intent == "compare_rainfall_and_crops":
-            formatted = self._format_compare_rainfall_crops(results)
-        elif intent == "district_extremes":
-            formatted = self._format_district_extremes(results)
-        elif intent == "production_trend_with_climate":
-            formatted = self._format_production_trend(results)
-        elif intent == "policy_arguments":
-            formatted = self._format_policy_arguments(results)
-        else:
+        formatter = self._FORMATTERS.get(intent)
+        if formatter is None:
             raise ValueError(f"Unknown intent: {intent}")
+        formatted = formatter(self, results)
 
         return {
             "answer": formatted["answer"],
@@ -73,22 +131,23 @@ class FormatStage(PipelineStage):
         state_a = results["state_a"]
         state_b = results["state_b"]
         years = results["years"]
-        rainfall_stats = results["rainfall_stats"]
+        rainfall_by_state = results["rainfall_by_state"]
         avg_a = results["avg_rainfall_a"]
         avg_b = results["avg_rainfall_b"]
         crop_rankings = results["crop_rankings"]
         crop_filter = results["crop_filter"]
         top_m = results["top_m"]
 
-        # Create rainfall table
-        pivot = rainfall_stats.pivot(index="year", columns="state", values="annual_rainfall_mm")
-        rainfall_rows = []
-        for year in years:
-            row = [int(year)]
-            for state in [state_a, state_b]:
-                value = pivot.get(state, {}).get(year, None)
-                row.append(float(round(float(value), 1)) if value is not None else None)
-            rainfall_rows.append(row)
+        # Create rainfall table by locating each year in the per-state sorted arrays
+        year_values = np.asarray(years, dtype=np.int64)
+        rainfall_rows = [
+            list(row)
+            for row in zip(
+                year_values.tolist(),
+                _rainfall_column(*rainfall_by_state[state_a], year_values),
+                _rainfall_column(*rainfall_by_state[state_b], year_values)
+            )
+        ]
 
         rainfall_table = {
             "title": "Average annual rainfall (mm)",
@@ -97,18 +156,15 @@ class FormatStage(PipelineStage):
         }
 
         # Create crop table
+        ranked_states = crop_rankings["state"]
         crop_rows = []
         for state in [state_a, state_b]:
-            subset = crop_rankings[crop_rankings["state"] == state]
-            if subset.empty:
+            mask = ranked_states == state
+            if not mask.any():
                 crop_rows.append([state, "No data", "—"])
                 continue
-            for _, row in subset.iterrows():
-                crop_rows.append([
-                    state,
-                    row["crop"],
-                    float(round(float(row["production_tonnes"]), 2))
-                ])
+            subset = {name: values[mask] for name, values in crop_rankings.items()}
+            crop_rows.extend(_column_rows(subset, _CROP_ROW_SPECS))
 
         crop_table = {
             "title": f"Top {top_m} crops by production" + (f" (filter: {crop_filter})" if crop_filter else ""),
@@ -116,32 +172,19 @@ class FormatStage(PipelineStage):
             "rows": crop_rows
         }
 
-        # Generate answer
-        answer = (
-            f"Compared rainfall for {state_a} and {state_b} over {len(years)} year(s). "
+        # Generate answer from fragments joined once
+        parts = [
+            f"Compared rainfall for {state_a} and {state_b} over {len(years)} year(s). ",
             f"{state_a} averaged {avg_a:.1f} mm while {state_b} averaged {avg_b:.1f} mm."
-        )
-        if crop_filter:
-            answer += f" Filtered crop category: {crop_filter}."
-
-        # Citations
-        citations = [
-            {
-                "dataset": "rainfall",
-                "source": "https://data.gov.in/resources/rainfall-sub-division-wise-distribution",
-                "resource_id": "cca5f77c-68b3-43df-bd01-beb3b69204ed"
-            },
-            {
-                "dataset": "agriculture",
-                "source": "https://data.gov.in/resources/district-wise-crop-production-statistics",
-                "resource_id": "9ef84268-d588-465a-a308-a864a43d0070"
-            }
         ]
+        if crop_filter:
+            parts.append(f" Filtered crop category: {crop_filter}.")
+        answer = "".join(parts)
 
         return {
             "answer": answer,
             "tables": [rainfall_table, crop_table],
-            "citations": citations
+            "citations": list(_CITATIONS_RAINFALL_FIRST)
         }
 
     def _format_district_extremes(self, results: Dict) -> Dict:
@@ -165,7 +208,7 @@ class FormatStage(PipelineStage):
             rows.append([
                 state_a,
                 state_a_max["district"],
-                float(round(state_a_max["production"], 2))
+                round(state_a_max["production"], 2)
             ])
             parts.append(
                 f"{state_a}'s peak output came from {state_a_max['district']} "
@@ -180,7 +223,7 @@ class FormatStage(PipelineStage):
             rows.append([
                 state_b,
                 state_b_min["district"],
-                float(round(state_b_min["production"], 2))
+                round(state_b_min["production"], 2)
             ])
             parts.append(
                 f"{state_b}'s lowest output was {state_b_min['district']} "
@@ -195,16 +238,10 @@ class FormatStage(PipelineStage):
 
         answer = " ".join(parts)
 
-        citations = [{
-            "dataset": "agriculture",
-            "source": "https://data.gov.in/resources/district-wise-crop-production-statistics",
-            "resource_id": "9ef84268-d588-465a-a308-a864a43d0070"
-        }]
-
         return {
             "answer": answer,
             "tables": [table],
-            "citations": citations
+            "citations": list(_CITATIONS_AGRICULTURE_ONLY)
         }
 
     def _format_production_trend(self, results: Dict) -> Dict:
@@ -212,7 +249,7 @@ class FormatStage(PipelineStage):
         state = results["state"]
         crop = results["crop"]
         years = results["years"]
-        merged_data = results["merged_data"]
+        merged = results["merged_arrays"]
         correlation = results["correlation"]
         trend_pct = results["trend_pct"]
 
@@ -223,14 +260,7 @@ class FormatStage(PipelineStage):
         table = {
             "title": f"{state} {crop} vs rainfall",
             "headers": ["Year", "Production (tonnes)", "Rainfall (mm)"],
-            "rows": [
-                [
-                    int(row["year"]),
-                    float(round(float(row["production_tonnes"]), 2)),
-                    float(round(float(row["annual_rainfall_mm"]), 1))
-                ]
-                for _, row in merged_data.iterrows()
-            ]
+            "rows": _column_rows(merged, _TREND_ROW_SPECS)
         }
 
         # Generate answer
@@ -239,40 +269,19 @@ class FormatStage(PipelineStage):
             f"Rainfall correlation indicates {corr_text} (r={correlation:.2f})."
         )
 
-        # Citations
-        citations = [
-            {
-                "dataset": "agriculture",
-                "source": "https://data.gov.in/resources/district-wise-crop-production-statistics",
-                "resource_id": "9ef84268-d588-465a-a308-a864a43d0070"
-            },
-            {
-                "dataset": "rainfall",
-                "source": "https://data.gov.in/resources/rainfall-sub-division-wise-distribution",
-                "resource_id": "cca5f77c-68b3-43df-bd01-beb3b69204ed"
-            }
-        ]
-
         return {
             "answer": answer,
             "tables": [table],
-            "citations": citations
+            "citations": list(_CITATIONS_AGRICULTURE_FIRST)
         }
 
     @staticmethod
     def _interpret_correlation(coefficient: float) -> str:
         """Interpret correlation coefficient."""
-        if np.isnan(coefficient):
+        if math.isnan(coefficient):
             return "insufficient data for correlation"
         abs_coeff = abs(coefficient)
-        if abs_coeff >= 0.7:
-            level = "strong"
-        elif abs_coeff >= 0.4:
-            level = "moderate"
-        else:
-            level = "weak"
-        direction = "positive" if coefficient > 0 else "negative"
-        return f"{level} {direction} association"
+        return _INTERP[(int(abs_coeff >= 0.4) + int(abs_coeff >= 0.7), int(coefficient > 0))]
 
     def _format_policy_arguments(self, results: Dict) -> Dict:
         """Format policy arguments results."""
@@ -285,6 +294,7 @@ class FormatStage(PipelineStage):
 
         insights = []
         tables = []
+        n_years = len(years)
 
         # Format crop data
         for crop in [current_crop, proposed_crop]:
@@ -297,16 +307,13 @@ class FormatStage(PipelineStage):
             series = crop_data[crop]["series"]
 
             insights.append(
-                f"{crop}: avg {avg_prod:.1f} tonnes over {len(years)} year(s) with {growth:.1f}% total change."
+                f"{crop}: avg {avg_prod:.1f} tonnes over {n_years} year(s) with {growth:.1f}% total change."
             )
 
             tables.append({
                 "title": f"{crop} production",
                 "headers": ["Year", "Production (tonnes)"],
-                "rows": [
-                    [int(row["year"]), float(round(float(row["production_tonnes"]), 2))]
-                    for _, row in series.iterrows()
-                ]
+                "rows": _column_rows(series, _PRODUCTION_ROW_SPECS)
             })
 
         # Add rainfall context
@@ -323,34 +330,22 @@ class FormatStage(PipelineStage):
             tables.append({
                 "title": "Rainfall context",
                 "headers": ["Year", "Rainfall (mm)"],
-                "rows": [
-                    [int(row["year"]), float(round(float(row["annual_rainfall_mm"]), 1))]
-                    for _, row in rainfall_data.iterrows()
-                ]
+                "rows": _column_rows(rainfall_data, _RAINFALL_ROW_SPECS)
             })
 
         # Generate answer
-        answer = (
-            f"Supporting a shift towards {proposed_crop}: "
-            + "; ".join(insights[:3])
-        )
-
-        # Citations
-        citations = [
-            {
-                "dataset": "agriculture",
-                "source": "https://data.gov.in/resources/district-wise-crop-production-statistics",
-                "resource_id": "9ef84268-d588-465a-a308-a864a43d0070"
-            },
-            {
-                "dataset": "rainfall",
-                "source": "https://data.gov.in/resources/rainfall-sub-division-wise-distribution",
-                "resource_id": "cca5f77c-68b3-43df-bd01-beb3b69204ed"
-            }
-        ]
+        answer = f"Supporting a shift towards {proposed_crop}: {'; '.join(insights[:3])}"
 
         return {
             "answer": answer,
             "tables": tables,
-            "citations": citations
+            "citations": list(_CITATIONS_AGRICULTURE_FIRST)
         }
+
+    # Intent -> formatter dispatch table (plain functions, called with self)
+    _FORMATTERS = {
+        "compare_rainfall_and_crops": _format_compare_rainfall_crops,
+        "district_extremes": _format_district_extremes,
+        "production_trend_with_climate": _format_production_trend,
+        "policy_arguments": _format_policy_arguments,
+    }
@@ -51,7 +51,7 @@ class ParseStage(PipelineStage):
             Dictionary with 'intent' and 'params'
         """
         question = data["question"]
-        logger.info(f"Parsing question: {question}")
+        logger.info("Parsing question: %s", question)
 
         # Parse the question
         parsed = self.parser_fn(question)
@@ -62,5 +62,5 @@ class ParseStage(PipelineStage):
             "params": parsed.params
         }
 
-        logger.debug(f"Parsed intent: {parsed.intent}")
+        logger.debug("Parsed intent: %s", parsed.intent)
         return result
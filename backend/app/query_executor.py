@@ -8,8 +8,14 @@ This class:
 4. Returns the final result
 """
 import asyncio
+import copy
 import logging
-from typing import Dict, Any, Callable
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional, Tuple
 from .event_bus import event_bus, Event
 from .pipeline import ParseStage, DataLoadStage
 from .pipeline.analysis_stage import AnalysisStage
@@ -19,12 +25,25 @@ from .data_manager import DataManager
 
 logger = logging.getLogger(__name__)
 
+# Seconds a cached response stays valid; set SAMARTH_RESPONSE_CACHE_TTL=0 to disable
+RESPONSE_CACHE_TTL = float(os.getenv("SAMARTH_RESPONSE_CACHE_TTL", "600"))
+RESPONSE_CACHE_MAX = 512
+
+# Seconds a query may run; checked against a monotonic deadline at each stage boundary
+QUERY_TIMEOUT = 30.0
+
+
+def question_key(question: str) -> str:
+    """Normalized form of a question; the parser reads case- and padding-variants the same way."""
+    return question.strip().lower()
+
 
 class QueryExecutor:
     """
-    Executes queries through the event-driven pipeline.
+    Executes queries through the pipeline stages.
 
-    Architecture:
+    By default the stages run inline, one after another, in a worker thread.
+    Pass ``pipelined=True`` to route queries through the event bus instead:
     query.received → ParseStage → query.parsed
                                  ↓
                           DataLoadStage → data.loaded
@@ -34,44 +53,81 @@ class QueryExecutor:
                                              FormatStage → response.ready
     """
 
-    def __init__(self, parser_fn: Callable, data_manager: DataManager):
+    def __init__(self, parser_fn: Callable, data_manager: DataManager, pipelined: bool = False):
         """
         Initialize query executor and pipeline stages.
 
         Args:
             parser_fn: Question parser function
             data_manager: Data manager instance
+            pipelined: Dispatch stages through the event bus instead of calling them inline
         """
         self.parser_fn = parser_fn
         self.data_manager = data_manager
-        self.result_future = None
-
-        # Initialize pipeline stages (they auto-register with event bus)
+        self.pipelined = pipelined
+        # (question, data version) -> (stored at, response), least recently used first
+        self._resp_cache: OrderedDict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._resp_ttl = RESPONSE_CACHE_TTL
+        # Futures for in-flight queries, keyed by the req_id carried in event metadata
+        self._pending: Dict[str, asyncio.Future] = {}
+        # Dedicated workers for the inline pipeline, so concurrent queries' pandas work
+        # runs off the event loop without competing with other to_thread users
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if not pipelined:
+            self._executor = ThreadPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="samarth-query"
+            )
+
+        # Initialize pipeline stages
         self.parse_stage = ParseStage(event_bus, parser_fn)
         self.data_stage = DataLoadStage(event_bus, data_manager)
         self.analysis_stage = AnalysisStage(event_bus)
         self.format_stage = FormatStage(event_bus)
 
-        # Subscribe to final result
-        event_bus.subscribe("response.ready", self._handle_result)
-        event_bus.subscribe("pipeline.error", self._handle_error)
+        self._stages = (self.parse_stage, self.data_stage, self.analysis_stage, self.format_stage)
+
+        # Wire the stages and the final result into the bus (bus path only)
+        if pipelined:
+            for stage in self._stages:
+                stage.subscribe()
+            event_bus.subscribe("response.ready", self._handle_result)
+            event_bus.subscribe("pipeline.error", self._handle_error)
 
         logger.info("QueryExecutor initialized with all pipeline stages")
 
     def _handle_result(self, event: Event):
         """Handle the final result event."""
-        if self.result_future and not self.result_future.done():
-            self.result_future.set_result(event.data)
+        result_future = self._pending.pop(event.metadata.get("req_id"), None)
+        if result_future and not result_future.done():
+            result_future.set_result(event.data)
 
     def _handle_error(self, event: Event):
         """Handle pipeline error events."""
-        if self.result_future and not self.result_future.done():
+        result_future = self._pending.pop(event.metadata.get("req_id"), None)
+        if result_future and not result_future.done():
             error_msg = event.data.get("error", "Unknown error")
-            self.result_future.set_exception(Exception(error_msg))
+            # Keep a missed deadline distinguishable so callers can report a timeout
+            error_type = event.data.get("error_type")
+            if error_type is not None and issubclass(error_type, asyncio.TimeoutError):
+                result_future.set_exception(asyncio.TimeoutError(error_msg))
+            else:
+                result_future.set_exception(Exception(error_msg))
+
+    def _fast_path(self, question: str, deadline: float) -> Dict[str, Any]:
+        """Run the stages inline, feeding each stage's output to the next."""
+        data: Any = {"question": question}
+        metadata = {"source": "api", "deadline": deadline}
+        for stage in self._stages:
+            try:
+                data = stage.run(data, metadata)
+            except Exception as e:
+                logger.error("%s failed: %s", stage.__class__.__name__, e)
+                raise
+        return data
 
     async def execute_query(self, question: str) -> Dict[str, Any]:
         """
-        Execute a query through the event-driven pipeline.
+        Execute a query through the pipeline.
 
         Args:
             question: Natural language question
@@ -83,27 +139,88 @@ class QueryExecutor:
             asyncio.TimeoutError: If query times out
             Exception: If pipeline stage fails
         """
-        logger.info(f"Executing query: {question}")
+        logger.info("Executing query: %s", question)
+
+        cache_key = (question_key(question), self.data_manager.version)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            logger.info("Query served from response cache")
+            return cached
+
+        # Stages compare against this deadline, so the fast path arms no timer
+        deadline = time.monotonic() + QUERY_TIMEOUT
+
+        if not self.pipelined:
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._fast_path, question, deadline
+                )
+            except asyncio.TimeoutError:
+                logger.error("Query execution timed out")
+                raise
+            except Exception as e:
+                logger.error("Query execution failed: %s", e)
+                raise
+            logger.info("Query completed successfully")
+            self._store_response(cache_key, result)
+            return result
 
-        # Create a future to wait for result
-        loop = asyncio.get_event_loop()
-        self.result_future = loop.create_future()
+        # Register a per-call future under a request id carried in the event
+        # metadata so concurrent queries never resolve each other's futures
+        req_id = uuid.uuid4().hex
+        result_future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = result_future
 
-        # Publish initial event to start pipeline
-        event_bus.publish(
+        # Publish initial event to start pipeline; stages await each other,
+        # so the pipeline is complete once this returns
+        pipeline = event_bus.publish_async(
             topic="query.received",
             data={"question": question},
-            metadata={"source": "api"}
+            metadata={"source": "api", "req_id": req_id, "deadline": deadline}
         )
 
         # Wait for result with timeout
         try:
-            result = await asyncio.wait_for(self.result_future, timeout=30.0)
+            await asyncio.wait_for(pipeline, timeout=QUERY_TIMEOUT)
+            result = await result_future
             logger.info("Query completed successfully")
+            self._store_response(cache_key, result)
             return result
         except asyncio.TimeoutError:
             logger.error("Query execution timed out")
             raise
         except Exception as e:
-            logger.error(f"Query execution failed: {e}")
+            logger.error("Query execution failed: %s", e)
             raise
+        finally:
+            self._pending.pop(req_id, None)
+            if result_future.done() and not result_future.cancelled():
+                result_future.exception()  # The stage error was already raised; mark it retrieved
+
+    def close(self):
+        """Shut down the worker pool used by the inline pipeline."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _cached_response(self, key: Tuple[str, int]) -> Optional[Dict[str, Any]]:
+        """Return a copy of a fresh cached response, dropping it if expired."""
+        if self._resp_ttl <= 0:
+            return None
+        entry = self._resp_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at >= self._resp_ttl:
+            del self._resp_cache[key]
+            return None
+        self._resp_cache.move_to_end(key)
+        return copy.deepcopy(response)
+
+    def _store_response(self, key: Tuple[str, int], response: Dict[str, Any]):
+        """Cache a copy of a response, evicting the least recently used beyond the limit."""
+        if self._resp_ttl <= 0:
+            return
+        self._resp_cache[key] = (time.monotonic(), copy.deepcopy(response))
+        self._resp_cache.move_to_end(key)
+        while len(self._resp_cache) > RESPONSE_CACHE_MAX:
+            self._resp_cache.popitem(last=False)
@@ -1,3 +1,4 @@
+import functools
 import re
 from dataclasses import dataclass
 from typing import Optional, Dict
@@ -9,9 +10,6 @@ class ParsedQuestion:
     params: Dict
 
 
-# Match state names (up to 6 words) - more restrictive but case insensitive
-STATE_NAME_PATTERN = r"[A-Za-z]+(?:\s+[A-Za-z]+){0,5}"
-
 KNOWN_STATE_NAMES = {
     "Andhra Pradesh",
     "Arunachal Pradesh",
@@ -50,63 +48,243 @@ KNOWN_STATE_NAMES = {
     "Dadra And Nagar Haveli And Daman And Diu",
     "Lakshadweep",
 }
-STATE_PAIR_REGEX = re.compile(
-    rf"in\s+({STATE_NAME_PATTERN})\s+(?:and|vs\.?|versus|&)\s+({STATE_NAME_PATTERN})\b",
-    re.IGNORECASE
+# Lowercased name -> canonical spelling, so validation is a single hash lookup
+_STATE_LOOKUP = {name.lower(): name for name in KNOWN_STATE_NAMES}
+# Filler words trimmed from state/crop candidates; shared members live in one base set
+_COMMON_EXCLUDE_TOKENS = frozenset({
+    "most",
+    "recent",
+    "year",
+    "years",
+    "district",
+    "compare",
+    "with",
+    "the",
+    "over",
+    "past",
+    "previous",
+    "list",
+    "top",
+    "state",
+    "states",
+    "crop",
+    "crops",
+    "rainfall",
+    "production",
+    "average",
+    "annual",
+    "trend",
+    "policy",
+    "best",
+    "worst",
+    "performing",
+    "performance",
+    "question",
+})
+STATE_EXCLUDE_TOKENS = _COMMON_EXCLUDE_TOKENS | frozenset({
+    "available",
+    "lowest",
+    "highest",
+    "that",
+    "vs",
+    "versus",
+    "in",
+    "for",
+    "yield",
+    "had",
+    "having",
+})
+CROP_EXCLUDE_TOKENS = _COMMON_EXCLUDE_TOKENS | frozenset({
+    "data",
+    "districts",
+    # Extremes and question words that lead a "Crop in State" span
+    "highest",
+    "lowest",
+    "maximum",
+    "minimum",
+    "max",
+    "min",
+    "which",
+    "what",
+    "identify",
+    "find",
+    "show",
+    "how",
+    "does",
+})
+# Match state names (up to 6 words); sanitizing trims filler words off either end
+STATE_SPAN_PATTERN = r"[a-z]+(?:\s+[a-z]+){0,5}"
+# Exactly one known state name (longest first, any whitespace between words), with
+# optional filler words around it, for spans that run on past the state
+# ("Punjab over the last 5 years") and so can't be trimmed down to it
+STATE_NAME_PATTERN = "(?:" + "|".join(
+    r"\s+".join(re.escape(word) for word in name.lower().split())
+    for name in sorted(KNOWN_STATE_NAMES, key=len, reverse=True)
+) + ")"
+STATE_FILLER_PATTERN = "(?:" + "|".join(sorted(STATE_EXCLUDE_TOKENS, key=len, reverse=True)) + ")"
+STATE_PINNED_PATTERN = rf"(?:{STATE_FILLER_PATTERN}\s+)*{STATE_NAME_PATTERN}(?:\s+{STATE_FILLER_PATTERN})*"
+STATE_NAME_REGEX = re.compile(rf"\b{STATE_NAME_PATTERN}\b")
+WORD_REGEX = re.compile(r"[a-z]+")
+
+
+def _build_state_trie() -> Dict:
+    """Prefix tree over the lowercased words of each state; "$" marks the canonical name."""
+    trie: Dict = {}
+    for name in KNOWN_STATE_NAMES:
+        node = trie
+        for word in name.lower().split():
+            node = node.setdefault(word, {})
+        node["$"] = name
+    return trie
+
+
+STATE_TRIE = _build_state_trie()
+
+STATE_CONNECTOR_PATTERN = r"(?:and|vs\.?|versus|&)"
+# "State1 <connector> State2" phrasings in precedence order; {a}/{b} mark the states
+STATE_PAIR_PHRASINGS = (
+    # "in State1 compare to State2" (e.g., "in Kerala compare to Punjab")
+    ("to", r"in\s+{a}\s+compare\s+to\s+{b}\b"),
+    # "for State1 and State2" (e.g., "for Kerala vs Punjab")
+    ("for", rf"for\s+{{a}}\s+{STATE_CONNECTOR_PATTERN}\s+{{b}}\b"),
+    # "in State1 and State2"
+    ("in", rf"in\s+{{a}}\s+{STATE_CONNECTOR_PATTERN}\s+{{b}}\b"),
+    # "between State1 and State2"
+    ("between", rf"between\s+{{a}}\s+{STATE_CONNECTOR_PATTERN}\s+{{b}}\b"),
+    # "compare State1 and State2" or "compare rainfall in State1 and State2"
+    ("cmp", rf"compare\s+(?:.*?\s+(?:in|for)\s+)?{{a}}\s+{STATE_CONNECTOR_PATTERN}\s+{{b}}\b"),
+)
+STATE_PAIR_GROUPS = tuple((f"{key}_a", f"{key}_b") for key, _ in STATE_PAIR_PHRASINGS)
+
+
+def _build_state_pair_regex(state_pattern: str) -> "re.Pattern[str]":
+    """
+    Combine the pair phrasings into one pattern for ``match`` at the start of the question.
+
+    Each phrasing is a lookahead that scans the whole question, and the alternatives are
+    tried in order, so the first phrasing that occurs anywhere wins and, within it, the
+    earliest occurrence. The named group pair that participates tells which one matched.
+    """
+    return re.compile("|".join(
+        r"(?=[\s\S]*?" + phrasing.format(
+            a=f"(?P<{key}_a>{state_pattern})", b=f"(?P<{key}_b>{state_pattern})"
+        ) + ")"
+        for key, phrasing in STATE_PAIR_PHRASINGS
+    ))
+
+
+STATE_SPAN_PAIR_REGEX = _build_state_pair_regex(STATE_SPAN_PATTERN)
+STATE_PAIR_REGEX = _build_state_pair_regex(STATE_PINNED_PATTERN)
+PLACEHOLDER_STATE_REGEX = re.compile(r"state[_\s]?([a-z]+)")
+
+# Year ranges: "last 5 years", or "over/during/for/in (the) (last) 5 years"
+YEARS_REGEX = re.compile(
+    r"(?:(?:last|past|previous|recent)\s+"
+    r"|(?:over|during|for|in)\s+(?:the\s+)?(?:last|past|previous)?\s*)"
+    r"(\d+)\s+years?"
 )
-STATE_BETWEEN_REGEX = re.compile(
-    rf"between\s+({STATE_NAME_PATTERN})\s+(?:and|vs\.?|versus|&)\s+({STATE_NAME_PATTERN})\b",
-    re.IGNORECASE
+# Top N as "top 5" (group 1) or "5 most" (group 2)
+TOP_M_REGEX = re.compile(r"(?:top|first|best|leading|main)\s+(\d+)|(\d+)\s+(?:most|top|best|leading|main)")
+YEAR_VALUE_REGEX = re.compile(r"most recent year|(\d{4})")
+
+# Region phrasings
+REGION_IN_REGEX = re.compile(r"in\s+([a-z\s]+?)(?:\s+(?:over|during|across|based|for|with)|,|\.|\?|$)")
+REGION_PLACEHOLDER_REGEX = re.compile(r"region[_\s]?([a-z]+)")
+
+# Crop phrasings used by _extract_crop in one pattern; the named group that
+# participates tells which phrasing matched:
+#   for_in: "for Crop in State" (e.g., "for Soybean in Karnataka")
+#   trend:  "production trend of Crop in"
+#   prod:   "production of Crop"
+CROP_COMBINED_REGEX = re.compile(
+    r"for\s+(?P<for_in>[a-z\s]+?)\s+in\s+"
+    r"|production trend of\s+(?P<trend>[a-z\s]+?)\s+in"
+    r"|production of\s+(?P<prod>[a-z\s]+?)(?:\s+in|\s+over|,|\.|\?|$)"
 )
-STATE_FOR_REGEX = re.compile(
-    rf"for\s+({STATE_NAME_PATTERN})\s+(?:and|vs\.?|versus|&)\s+({STATE_NAME_PATTERN})\b",
-    re.IGNORECASE
+CROP_COMBINED_GROUPS = ("for_in", "trend", "prod")
+CROP_IN_STATE_REGEX = re.compile(r"([a-z\s]+?)\s+in\s+([a-z\s]+?)(?:\s+and|\s+in|\s+,|\s+\.|\s+\?|$)")
+CROP_PLACEHOLDER_REGEX = re.compile(r"crop(?:_type)?[_\s]?([a-z]+)")
+
+# Crop pairs for policy questions
+CROP_TYPE_PAIR_REGEX = re.compile(r"crop[_\s]?type[_\s]?([a-z]+)")
+PROMOTE_REGEX = re.compile(r"promote\s+([a-z\s]+?)\s+over\s+([a-z\s]+?)(?:\s+in|\s+across|\.|$)")
+
+# Crop filter phrasings for rainfall comparisons, tried in order
+TOP_CROP_LIST_REGEX = re.compile(r"top\s+([a-z\s]+?)\s+and\s+([a-z\s]+?)\s+crops?")
+CROP_AND_REGEX = re.compile(r"([a-z\s]+?)\s+and\s+([a-z\s]+?)\s+crops?")
+CROPS_OF_REGEX = re.compile(r"crops of ([a-z\s]+?)(?:\(|for|in|,|\.|$)")
+CROP_BEFORE_BY_REGEX = re.compile(r"([a-z\s]+?)\s+crops?\s+by")
+
+# District extremes fallbacks
+STATE_IN_AND_REGEX = re.compile(r"in\s+([a-z\s]+?)\s+and\s+([a-z\s]+?)(?:\s+in|\s+,|\s+\.|\s+\?|$)")
+INLINE_STATE_REGEX = re.compile(
+    r"\bin\s+([a-z\s]+?)(?=(?:\s+(?:and|with|having|showing|that|had|for)|\s*,|\s*\?|\.|$))"
 )
-# For "compare X and Y" or "compare rainfall in X and Y"
-COMPARE_STATES_REGEX = re.compile(
-    rf"compare\s+(?:.*?\s+(?:in|for)\s+)?({STATE_NAME_PATTERN})\s+(?:and|vs\.?|versus|&)\s+({STATE_NAME_PATTERN})\b",
-    re.IGNORECASE
+FOR_CROP_IN_STATE_REGEX = re.compile(r"for\s+([a-z\s]+?)\s+in\s+([a-z\s]+?)(?:\s+and|\s+,|\s+\.|\s+\?|$)")
+CROP_PHRASE_REGEX = re.compile(r"(?:production of|for)\s+([a-z\s]+?)\s+in")
+
+# Intent keywords, matched anywhere in the lowercased question (so "crop" also covers "crops")
+INTENT_KEYWORDS = (
+    "rainfall", "top", "list", "crop", "district", "trend", "show", "policy", "scheme",
+    "promote", "production", "compare",
+    "highest", "max", "maximum", "peak", "best",
+    "lowest", "min", "minimum", "worst", "bottom",
 )
-# For "in State1 compare to State2" pattern (e.g., "in Kerala compare to Punjab")
-COMPARE_TO_REGEX = re.compile(
-    rf"in\s+({STATE_NAME_PATTERN})\s+compare\s+to\s+({STATE_NAME_PATTERN})\b",
-    re.IGNORECASE
+KEYWORD_BITS = {keyword: 1 << i for i, keyword in enumerate(INTENT_KEYWORDS)}
+KW_RAINFALL = KEYWORD_BITS["rainfall"]
+KW_TOP_OR_LIST = KEYWORD_BITS["top"] | KEYWORD_BITS["list"]
+KW_CROP = KEYWORD_BITS["crop"]
+KW_DISTRICT = KEYWORD_BITS["district"]
+KW_TREND = KEYWORD_BITS["trend"]
+KW_TREND_OR_SHOW = KW_TREND | KEYWORD_BITS["show"]
+KW_POLICY = KEYWORD_BITS["policy"] | KEYWORD_BITS["scheme"] | KEYWORD_BITS["promote"]
+KW_PRODUCTION = KEYWORD_BITS["production"]
+KW_PROMOTE_OR_COMPARE = KEYWORD_BITS["promote"] | KEYWORD_BITS["compare"]
+KW_HIGH = sum(KEYWORD_BITS[k] for k in ("highest", "max", "maximum", "peak", "best", "top"))
+KW_LOW = sum(KEYWORD_BITS[k] for k in ("lowest", "min", "minimum", "worst", "bottom"))
+# Any keyword the looser fallback heuristics could act on
+KW_FALLBACK = KW_RAINFALL | KW_DISTRICT | KW_TREND | KW_PROMOTE_OR_COMPARE
+
+# A zero-width lookahead tries every position, so overlapping keywords ("minimum" and
+# "min") are all seen in one scan; the longest keyword at a position carries the bits
+# of the shorter keywords it starts with
+KEYWORD_REGEX = re.compile(
+    "(?=(" + "|".join(sorted(INTENT_KEYWORDS, key=len, reverse=True)) + "))"
 )
+KEYWORD_PREFIX_BITS = {
+    keyword: sum(bit for other, bit in KEYWORD_BITS.items() if keyword.startswith(other))
+    for keyword in INTENT_KEYWORDS
+}
+
+
+def _keyword_mask(lowered: str) -> int:
+    """Bitmask of the INTENT_KEYWORDS occurring anywhere in `lowered`."""
+    mask = 0
+    for match in KEYWORD_REGEX.finditer(lowered):
+        mask |= KEYWORD_PREFIX_BITS[match.group(1)]
+    return mask
 
 
-def _extract_years(text: str) -> Optional[int]:
+def _extract_years(lowered: str) -> Optional[int]:
     # Support multiple phrasings for year ranges
-    patterns = [
-        r"(?:last|past|previous|recent)\s+(\d+)\s+years?",
-        r"over\s+(?:the\s+)?(?:last|past|previous)?\s*(\d+)\s+years?",
-        r"during\s+(?:the\s+)?(?:last|past|previous)?\s*(\d+)\s+years?",
-        r"for\s+(?:the\s+)?(?:last|past|previous)?\s*(\d+)\s+years?",
-        r"in\s+(?:the\s+)?(?:last|past|previous)?\s*(\d+)\s+years?",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
+    match = YEARS_REGEX.search(lowered)
+    if match:
+        return int(match.group(1))
     return None
 
 
-def _extract_top_m(text: str) -> int:
+def _extract_top_m(lowered: str) -> int:
     # Support multiple phrasings for top N
-    patterns = [
-        r"(?:top|first|best|leading|main)\s+(\d+)",
-        r"(\d+)\s+(?:most|top|best|leading|main)",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
+    match = TOP_M_REGEX.search(lowered)
+    if match:
+        return int(match.group(1) or match.group(2))
     return 3
 
 
 def _clean_token(value: Optional[str]) -> Optional[str]:
     if not value:
         return None
-    return re.sub(r"\s+", " ", value.strip())
+    return " ".join(value.split())
 
 
 def _normalize_state_name(state: Optional[str]) -> Optional[str]:
@@ -120,24 +298,19 @@ def _normalize_state_name(state: Optional[str]) -> Optional[str]:
 
 def _sanitize_state_candidate(state: Optional[str]) -> Optional[str]:
     """Normalize and validate a potential state name."""
-    normalized = _normalize_state_name(_clean_token(state))
-    if not normalized:
+    if not state:
         return None
-    tokens = normalized.split()
+    tokens = state.lower().split()
     # Trim leading/trailing filler tokens
-    while tokens and tokens[0].lower() in STATE_EXCLUDE_TOKENS:
+    while tokens and tokens[0] in STATE_EXCLUDE_TOKENS:
         tokens.pop(0)
-    while tokens and tokens[-1].lower() in STATE_EXCLUDE_TOKENS:
+    while tokens and tokens[-1] in STATE_EXCLUDE_TOKENS:
         tokens.pop()
     if not tokens:
         return None
-    cleaned = " ".join(tokens)
-    lowered_tokens = [t.lower() for t in tokens]
-    if any(token in STATE_EXCLUDE_TOKENS for token in lowered_tokens):
-        return None
-    if cleaned not in KNOWN_STATE_NAMES:
+    if any(token in STATE_EXCLUDE_TOKENS for token in tokens):
         return None
-    return cleaned
+    return _STATE_LOOKUP.get(" ".join(tokens))
 
 
 def _sanitize_crop_candidate(value: Optional[str]) -> Optional[str]:
@@ -154,87 +327,111 @@ def _sanitize_crop_candidate(value: Optional[str]) -> Optional[str]:
     return cleaned
 
 
-def _extract_state_pair(text: str) -> tuple[Optional[str], Optional[str]]:
-    # Try "in State1 compare to State2" pattern first (e.g., "in Kerala compare to Punjab")
-    compare_to = COMPARE_TO_REGEX.search(text)
-    if compare_to:
-        return _sanitize_state_candidate(compare_to.group(1)), _sanitize_state_candidate(compare_to.group(2))
-
-    # Try "for State1 and State2" pattern (e.g., "for Kerala vs Punjab")
-    state_for = STATE_FOR_REGEX.search(text)
-    if state_for:
-        return _sanitize_state_candidate(state_for.group(1)), _sanitize_state_candidate(state_for.group(2))
-    
-    # Try direct "in State1 and State2" pattern
-    direct = STATE_PAIR_REGEX.search(text)
-    if direct:
-        return _sanitize_state_candidate(direct.group(1)), _sanitize_state_candidate(direct.group(2))
-
-    # Try "between State1 and State2" pattern
-    between = STATE_BETWEEN_REGEX.search(text)
-    if between:
-        return _sanitize_state_candidate(between.group(1)), _sanitize_state_candidate(between.group(2))
-
-    # Try "compare State1 and State2" pattern
-    compare = COMPARE_STATES_REGEX.search(text)
-    if compare:
-        return _sanitize_state_candidate(compare.group(1)), _sanitize_state_candidate(compare.group(2))
+def _scan_states(lowered: str) -> list[tuple[int, int]]:
+    """
+    Walk the words of a lowercased question once, greedily matching the longest
+    known state at each position.
+
+    Returns (start word, end word) for each state found.
+    """
+    words = WORD_REGEX.findall(lowered)
+    hits = []
+    i = 0
+    while i < len(words):
+        node = STATE_TRIE
+        hit = None
+        j = i
+        while j < len(words) and words[j] in node:
+            node = node[words[j]]
+            j += 1
+            if "$" in node:
+                hit = (i, j)
+        if hit:
+            hits.append(hit)
+            i = hit[1]
+        else:
+            i += 1
+    return hits
+
+
+def _extract_state_pair(lowered: str) -> tuple[Optional[str], Optional[str]]:
+    # The connector patterns only ever yield whole-word known states, so skip
+    # them when a walk of the words finds none
+    if _scan_states(lowered):
+        pair = _extract_connected_states(lowered)
+        if pair is not None:
+            return pair
 
     # Fallback: look for placeholder patterns
-    placeholders = re.findall(r"state[_\s]?([A-Za-z]+)", text, re.IGNORECASE)
+    placeholders = PLACEHOLDER_STATE_REGEX.findall(lowered)
     if len(placeholders) >= 2:
         return _sanitize_state_candidate(placeholders[0]), _sanitize_state_candidate(placeholders[1])
 
     return None, None
 
 
-def _extract_region(text: str) -> Optional[str]:
+def _extract_connected_states(lowered: str) -> Optional[tuple[Optional[str], Optional[str]]]:
+    """Match the first "State1 <connector> State2" phrasing; None when no phrasing matches."""
+    pair = _match_state_pair(STATE_SPAN_PAIR_REGEX, lowered)
+    if pair is None:
+        return None
+    state_a, state_b = pair
+    if state_a is None or state_b is None:
+        # Retry with the states pinned to known names, keeping any side already found
+        pinned = _match_state_pair(STATE_PAIR_REGEX, lowered)
+        if pinned is not None and state_a in (None, pinned[0]) and state_b in (None, pinned[1]):
+            return pinned
+    return state_a, state_b
+
+
+def _match_state_pair(regex: "re.Pattern[str]", lowered: str) -> Optional[tuple[Optional[str], Optional[str]]]:
+    match = regex.match(lowered)
+    if match:
+        for group_a, group_b in STATE_PAIR_GROUPS:
+            if match.group(group_a) is not None:
+                return _sanitize_state_candidate(match.group(group_a)), _sanitize_state_candidate(match.group(group_b))
+    return None
+
+
+def _extract_region(lowered: str) -> Optional[str]:
     # Try "in State" pattern (more specific, stops at keywords)
-    match = re.search(r"in\s+([A-Za-z\s]+?)(?:\s+(?:over|during|across|based|for|with)|,|\.|\?|$)", text, re.IGNORECASE)
+    match = REGION_IN_REGEX.search(lowered)
     if match:
         state = _normalize_state_name(_clean_token(match.group(1)))
         # Exclude common non-state words
         if state and state.lower() not in ["the", "last", "past", "recent", "years"]:
             return state
-    match = re.search(r"region[_\s]?([A-Za-z]+)", text, re.IGNORECASE)
+    match = REGION_PLACEHOLDER_REGEX.search(lowered)
     if match:
         return _normalize_state_name(_clean_token(match.group(1)))
     return None
 
 
-def _extract_crop(text: str) -> Optional[str]:
-    # Try "for Crop in State" pattern (e.g., "for Soybean in Karnataka")
-    match = re.search(r"for\s+([A-Za-z\s]+?)\s+in\s+", text, re.IGNORECASE)
-    if match:
-        candidate = _sanitize_crop_candidate(match.group(1))
-        if candidate:
-            return candidate
-    # Try "production trend of Crop" pattern
-    match = re.search(r"production trend of\s+([A-Za-z\s]+?)\s+in", text, re.IGNORECASE)
+def _extract_crop(lowered: str) -> Optional[str]:
+    # Try the "for Crop in", "production trend of Crop" and "production of Crop" phrasings
+    match = CROP_COMBINED_REGEX.search(lowered)
     if match:
-        candidate = _sanitize_crop_candidate(match.group(1))
-        if candidate:
-            return candidate
-    # Try "production of Crop" pattern
-    match = re.search(r"production of\s+([A-Za-z\s]+?)(?:\s+in|\s+over|,|\.|\?|$)", text, re.IGNORECASE)
-    if match:
-        candidate = _sanitize_crop_candidate(match.group(1))
-        if candidate:
-            return candidate
+        for name in CROP_COMBINED_GROUPS:
+            value = match.group(name)
+            if value is not None:
+                candidate = _sanitize_crop_candidate(value)
+                if candidate:
+                    return candidate
+                break
     # Try "Crop in State" pattern for district extremes (e.g., "Pearl Millet in Maharashtra")
-    match = re.search(r"([A-Za-z\s]+?)\s+in\s+([A-Za-z\s]+?)(?:\s+and|\s+in|\s+,|\s+\.|\s+\?|$)", text, re.IGNORECASE)
+    match = CROP_IN_STATE_REGEX.search(lowered)
     if match:
         potential_crop = _clean_token(match.group(1))
         # Check if it's a known crop name (multi-word like "Pearl Millet", "Tamil Nadu")
         if potential_crop and len(potential_crop.split()) <= 3:
-            # If the next part is a state name pattern, this is likely the crop
-            next_part = match.group(2).strip()
-            if any(state_word in next_part.lower() for state_word in ["maharashtra", "tamil", "nadu", "kerala", "karnataka", "punjab"]):
+            # If a whole known state name starts in the next part, this is likely the crop
+            state = STATE_NAME_REGEX.search(lowered, match.start(2))
+            if state and state.start() < match.end(2):
                 candidate = _sanitize_crop_candidate(potential_crop)
                 if candidate:
                     return candidate
     # Try "crop_type" pattern
-    match = re.search(r"crop(?:_type)?[_\s]?([A-Za-z]+)", text, re.IGNORECASE)
+    match = CROP_PLACEHOLDER_REGEX.search(lowered)
     if match:
         candidate = _sanitize_crop_candidate(match.group(1))
         if candidate and len(candidate) > 1:
@@ -242,16 +439,12 @@ def _extract_crop(text: str) -> Optional[str]:
     return None
 
 
-def _extract_crop_pair(text: str) -> list[str]:
-    crops = re.findall(r"crop[_\s]?type[_\s]?([A-Za-z]+)", text, re.IGNORECASE)
+def _extract_crop_pair(lowered: str) -> list[str]:
+    crops = CROP_TYPE_PAIR_REGEX.findall(lowered)
     if crops:
         sanitized = [_sanitize_crop_candidate(c) for c in crops]
         return [c for c in sanitized if c]
-    promote_match = re.search(
-        r"promote\s+([A-Za-z\s]+?)\s+over\s+([A-Za-z\s]+?)(?:\s+in|\s+across|\.|$)",
-        text,
-        re.IGNORECASE,
-    )
+    promote_match = PROMOTE_REGEX.search(lowered)
     if promote_match:
         candidates = [
             _sanitize_crop_candidate(promote_match.group(1)),
@@ -261,76 +454,107 @@ def _extract_crop_pair(text: str) -> list[str]:
     return []
 
 
+class _Features:
+    """Extractor results for one lowered question, each computed on first use."""
+
+    def __init__(self, lowered: str):
+        self.lowered = lowered
+
+    @functools.cached_property
+    def state_pair(self) -> tuple[Optional[str], Optional[str]]:
+        return _extract_state_pair(self.lowered)
+
+    @functools.cached_property
+    def crop(self) -> Optional[str]:
+        return _extract_crop(self.lowered)
+
+    @functools.cached_property
+    def region(self) -> Optional[str]:
+        return _extract_region(self.lowered)
+
+    @functools.cached_property
+    def years(self) -> Optional[int]:
+        return _extract_years(self.lowered)
+
+    @functools.cached_property
+    def top_m(self) -> int:
+        return _extract_top_m(self.lowered)
+
+
 def parse_question(question: str) -> ParsedQuestion:
-    text = question.strip()
-    lowered = text.lower()
+    intent, params = _parse_cached(question)
+    # Fresh dict per call so callers can't alter the cached parse
+    return ParsedQuestion(intent=intent, params=dict(params))
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_cached(question: str) -> tuple[str, tuple]:
+    """Memoized parse, frozen to (intent, params items) so cached results stay immutable."""
+    parsed = _parse(question)
+    return parsed.intent, tuple(parsed.params.items())
+
 
-    if "rainfall" in lowered and ("top" in lowered or "list" in lowered) and "crop" in lowered:
-        state_a, state_b = _extract_state_pair(text)
+def _parse(question: str) -> ParsedQuestion:
+    lowered = question.strip().lower()
+    mask = _keyword_mask(lowered)
+    features = _Features(lowered)
+
+    if mask & KW_RAINFALL and mask & KW_TOP_OR_LIST and mask & KW_CROP:
+        state_a, state_b = features.state_pair
         crop_filter = None
         # Try "top X and Y crops" pattern (e.g., "top Wheat and Maize crops")
-        crop_list_match = re.search(r"top\s+([A-Za-z\s]+?)\s+and\s+([A-Za-z\s]+?)\s+crops?", text, re.IGNORECASE)
+        crop_list_match = TOP_CROP_LIST_REGEX.search(lowered)
         if crop_list_match:
             # For multiple crops, use the first one as filter
             crop_filter = _sanitize_crop_candidate(crop_list_match.group(1))
         else:
             # Try "X and Y crops" pattern (e.g., "Wheat and Maize crops by district")
-            crop_and_match = re.search(r"([A-Za-z\s]+?)\s+and\s+([A-Za-z\s]+?)\s+crops?", text, re.IGNORECASE)
+            crop_and_match = CROP_AND_REGEX.search(lowered)
             if crop_and_match:
                 crop_filter = _sanitize_crop_candidate(crop_and_match.group(1))
             else:
                 # Try "crops of X" pattern
-                crop_phrase = re.search(r"crops of ([A-Za-z\s]+?)(?:\(|for|in|,|\.|$)", text, re.IGNORECASE)
+                crop_phrase = CROPS_OF_REGEX.search(lowered)
                 if crop_phrase:
                     crop_filter = _sanitize_crop_candidate(crop_phrase.group(1))
                 else:
                     # Try to extract single crop or crop mentioned before "crops"
-                    crop_before = re.search(r"([A-Za-z\s]+?)\s+crops?\s+by", text, re.IGNORECASE)
+                    crop_before = CROP_BEFORE_BY_REGEX.search(lowered)
                     if crop_before:
                         crop_filter = _sanitize_crop_candidate(crop_before.group(1))
                     else:
-                        crop_filter = _extract_crop(text)
+                        crop_filter = features.crop
         params = {
             "state_a": state_a,
             "state_b": state_b,
-            "years": _extract_years(lowered),
-            "top_m": _extract_top_m(lowered),
+            "years": features.years,
+            "top_m": features.top_m,
             "crop_filter": crop_filter,
         }
         return ParsedQuestion(intent="compare_rainfall_and_crops", params=params)
 
     # Check for district extremes with various keywords
-    has_high = any(word in lowered for word in ["highest", "max", "maximum", "peak", "best", "top"])
-    has_low = any(word in lowered for word in ["lowest", "min", "minimum", "worst", "bottom"])
-
-    if "district" in lowered and (has_high or has_low):
-        state_a, state_b = _extract_state_pair(text)
+    if mask & KW_DISTRICT and mask & (KW_HIGH | KW_LOW):
+        state_a, state_b = features.state_pair
         
         # Try to extract states from "for Crop in State1 and State2" pattern
         if not state_a or not state_b:
-            state_in_pattern = re.search(r"in\s+([A-Za-z\s]+?)\s+and\s+([A-Za-z\s]+?)(?:\s+in|\s+,|\s+\.|\s+\?|$)", text, re.IGNORECASE)
+            state_in_pattern = STATE_IN_AND_REGEX.search(lowered)
             if state_in_pattern:
                 if not state_a:
                     state_a = _sanitize_state_candidate(state_in_pattern.group(1))
                 if not state_b:
                     state_b = _sanitize_state_candidate(state_in_pattern.group(2))
 
-        # Fallback: extract states inline
+        # Fallback: extract states inline, stopping once two are found
         if not state_a or not state_b:
-            inline_states = [
-                _sanitize_state_candidate(s)
-                for s in re.findall(
-                    r"\bin\s+([A-Za-z\s]+?)(?=(?:\s+(?:and|with|having|showing|that|had|for)|\s*,|\s*\?|\.|$))",
-                    text,
-                    re.IGNORECASE,
-                )
-                if _clean_token(s)
-            ]
-            inline_states = [
-                s
-                for s in inline_states
-                if s
-            ]
+            inline_states = []
+            for inline_match in INLINE_STATE_REGEX.finditer(lowered):
+                state = _sanitize_state_candidate(inline_match.group(1))
+                if state:
+                    inline_states.append(state)
+                    if len(inline_states) == 2:
+                        break
             if not state_a and inline_states:
                 state_a = inline_states[0]
             if (not state_b) and len(inline_states) > 1:
@@ -338,18 +562,16 @@ def parse_question(question: str) -> ParsedQuestion:
         
         # Try "for Crop in State" pattern
         crop = None
-        for_crop_match = re.search(r"for\s+([A-Za-z\s]+?)\s+in\s+([A-Za-z\s]+?)(?:\s+and|\s+,|\s+\.|\s+\?|$)", text, re.IGNORECASE)
+        for_crop_match = FOR_CROP_IN_STATE_REGEX.search(lowered)
         if for_crop_match:
             crop = _sanitize_crop_candidate(for_crop_match.group(1))
         else:
-            crop = _extract_crop(text)
+            crop = features.crop
         if not crop:
-            crop_phrase = re.search(
-                r"(?:production of|for)\s+([A-Za-z\s]+?)\s+in", text, re.IGNORECASE
-            )
+            crop_phrase = CROP_PHRASE_REGEX.search(lowered)
             if crop_phrase:
                 crop = _sanitize_crop_candidate(crop_phrase.group(1))
-        year_match = re.search(r"most recent year|(\d{4})", lowered)
+        year_match = YEAR_VALUE_REGEX.search(lowered)
         year = None
         if year_match and year_match.group(1):
             year = int(year_match.group(1))
@@ -362,45 +584,48 @@ def parse_question(question: str) -> ParsedQuestion:
         return ParsedQuestion(intent="district_extremes", params=params)
 
     # Production trend - catch "trend" or "show" with crop and region
-    if "trend" in lowered or "show" in lowered:
-        region = _extract_region(text)
-        crop = _extract_crop(text)
+    if mask & KW_TREND_OR_SHOW:
+        region = features.region
+        crop = features.crop
         # If we have both region and crop, it's likely a trend query
         if region and crop:
             params = {
                 "region": region,
                 "crop": crop.title() if crop else None,
-                "years": _extract_years(lowered),
+                "years": features.years,
             }
             return ParsedQuestion(intent="production_trend_with_climate", params=params)
 
     # Policy arguments - catch "policy", "scheme", or "promote"
-    if "policy" in lowered or "scheme" in lowered or "promote" in lowered:
-        crops = [c for c in _extract_crop_pair(text) if c]
-        region = _extract_region(text)
+    if mask & KW_POLICY:
+        crops = [c for c in _extract_crop_pair(lowered) if c]
+        region = features.region
         params = {
             "region": region,
             "crop_a": crops[0] if crops else None,
             "crop_b": crops[1] if len(crops) > 1 else None,
-            "years": _extract_years(lowered),
+            "years": features.years,
         }
         return ParsedQuestion(intent="policy_arguments", params=params)
 
-    # Fallback heuristics for looser phrasing
-    state_a, state_b = _extract_state_pair(text)
-    crop = _extract_crop(text)
+    # Fallback heuristics for looser phrasing; none apply without one of their keywords
+    if not mask & KW_FALLBACK:
+        return ParsedQuestion(intent="unknown", params={"raw": question})
+
+    state_a, state_b = features.state_pair
+    crop = features.crop
 
-    if "rainfall" in lowered and state_a and state_b:
+    if mask & KW_RAINFALL and state_a and state_b:
         params = {
             "state_a": state_a,
             "state_b": state_b,
-            "years": _extract_years(lowered),
-            "top_m": _extract_top_m(lowered),
+            "years": features.years,
+            "top_m": features.top_m,
             "crop_filter": crop,
         }
         return ParsedQuestion(intent="compare_rainfall_and_crops", params=params)
 
-    if "district" in lowered and state_a and state_b and crop:
+    if mask & KW_DISTRICT and state_a and state_b and crop:
         params = {
             "state_a": state_a,
             "state_b": state_b,
@@ -409,96 +634,23 @@ def parse_question(question: str) -> ParsedQuestion:
         }
         return ParsedQuestion(intent="district_extremes", params=params)
 
-    if "trend" in lowered and (crop or "production" in lowered):
-        region = _extract_region(text)
+    if mask & KW_TREND and (crop or mask & KW_PRODUCTION):
+        region = features.region
         params = {
             "region": region,
             "crop": crop.title() if crop else None,
-            "years": _extract_years(lowered),
+            "years": features.years,
         }
         return ParsedQuestion(intent="production_trend_with_climate", params=params)
 
-    if ("promote" in lowered or "compare" in lowered) and crop:
-        crops = _extract_crop_pair(text)
+    if mask & KW_PROMOTE_OR_COMPARE and crop:
+        crops = _extract_crop_pair(lowered)
         params = {
-            "region": _extract_region(text),
+            "region": features.region,
             "crop_a": crops[0] if crops else crop,
             "crop_b": crops[1] if len(crops) > 1 else None,
-            "years": _extract_years(lowered),
+            "years": features.years,
         }
         return ParsedQuestion(intent="policy_arguments", params=params)
 
     return ParsedQuestion(intent="unknown", params={"raw": question})
-STATE_EXCLUDE_TOKENS = {
-    "most",
-    "recent",
-    "year",
-    "years",
-    "available",
-    "lowest",
-    "highest",
-    "district",
-    "compare",
-    "that",
-    "with",
-    "the",
-    "over",
-    "vs",
-    "versus",
-    "in",
-    "for",
-    "past",
-    "previous",
-    "list",
-    "top",
-    "state",
-    "states",
-    "crop",
-    "crops",
-    "rainfall",
-    "production",
-    "yield",
-    "average",
-    "annual",
-    "trend",
-    "policy",
-    "best",
-    "worst",
-    "performing",
-    "performance",
-    "question",
-    "had",
-    "having",
-}
-CROP_EXCLUDE_TOKENS = {
-    "annual",
-    "average",
-    "best",
-    "compare",
-    "crops",
-    "crop",
-    "data",
-    "district",
-    "districts",
-    "list",
-    "most",
-    "over",
-    "past",
-    "performance",
-    "performing",
-    "policy",
-    "previous",
-    "production",
-    "question",
-    "rainfall",
-    "recent",
-    "state",
-    "states",
-    "the",
-    "top",
-    "trend",
-    "with",
-    "worst",
-    "years",
-    "year",
-}
@@ -0,0 +1,63 @@
+import math
+import unittest
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.analysis_stage import _fast_isin, _pearson
+
+
+class FastIsinTestCase(unittest.TestCase):
+    def setUp(self):
+        values = ["Maize", "Rice", np.nan, "Wheat", "Maize"]
+        self.plain = pd.Series(values, dtype=object)
+        self.categorical = pd.Series(values, dtype="category")
+
+    def test_matches_plain_isin(self):
+        for values in (["Maize"], ["Rice", "Wheat"], ["Maize", "Millet"]):
+            with self.subTest(values=values):
+                expected = self.plain.isin(values).to_numpy()
+                np.testing.assert_array_equal(_fast_isin(self.categorical, values), expected)
+                np.testing.assert_array_equal(_fast_isin(self.plain, values), expected)
+
+    def test_empty_filter_matches_nothing(self):
+        for col in (self.plain, self.categorical):
+            with self.subTest(dtype=str(col.dtype)):
+                mask = _fast_isin(col, [])
+                self.assertEqual(mask.dtype, bool)
+                self.assertFalse(mask.any())
+
+    def test_missing_values_never_match(self):
+        # Missing categoricals carry code -1, which no looked-up label maps to
+        mask = _fast_isin(self.categorical, ["Maize", "Rice", "Wheat"])
+        self.assertFalse(mask[2])
+        self.assertFalse(_fast_isin(self.categorical, ["Millet"]).any())
+
+
+class PearsonTestCase(unittest.TestCase):
+    def test_perfectly_correlated(self):
+        x = np.array([1.0, 2.0, 3.0, 4.0])
+        self.assertAlmostEqual(_pearson(x, 2 * x + 1), 1.0)
+        self.assertAlmostEqual(_pearson(x, -x), -1.0)
+
+    def test_constant_series_is_nan_without_warnings(self):
+        x = np.array([1.0, 2.0, 3.0])
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertTrue(math.isnan(_pearson(x, np.full(3, 5.0))))
+
+    def test_nan_pairs_are_skipped(self):
+        x = np.array([1.0, 2.0, np.nan, 4.0, 5.0])
+        y = np.array([2.0, 4.1, 6.0, np.nan, 9.7])
+        valid = ~(np.isnan(x) | np.isnan(y))
+        expected = np.corrcoef(x[valid], y[valid])[0, 1]
+        self.assertAlmostEqual(_pearson(x, y), expected)
+
+    def test_too_few_pairs_is_nan(self):
+        self.assertTrue(math.isnan(_pearson(np.array([]), np.array([]))))
+        self.assertTrue(math.isnan(_pearson(np.array([1.0, np.nan]), np.array([np.nan, 2.0]))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -59,6 +59,44 @@ class AnalyticsTestCase(unittest.TestCase):
         self.assertEqual(parsed.params["state_a"], "Karnataka")
         self.assertEqual(parsed.params["state_b"], "Maharashtra")
 
+    def test_question_parser_between_after_compare(self):
+        q = "Compare rainfall between Bihar & Goa over the last 5 years and list top 3 crops"
+        parsed = parse_question(q)
+        self.assertEqual(parsed.intent, "compare_rainfall_and_crops")
+        self.assertEqual(parsed.params["state_a"], "Bihar")
+        self.assertEqual(parsed.params["state_b"], "Goa")
+
+    def test_question_parser_pair_with_trailing_words(self):
+        q = (
+            "Compare the average annual rainfall in Karnataka and Maharashtra for the last 5 years. "
+            "List the top 3 most produced crops of Maize in each of those states during the same period."
+        )
+        parsed = parse_question(q)
+        self.assertEqual(parsed.intent, "compare_rainfall_and_crops")
+        self.assertEqual(parsed.params["state_a"], "Karnataka")
+        self.assertEqual(parsed.params["state_b"], "Maharashtra")
+        self.assertEqual(parsed.params["years"], 5)
+
+    def test_question_parser_pair_with_filler_words(self):
+        cases = [
+            ("highest district Maize in Karnataka and lowest in Maharashtra in 2019", "Karnataka", "Maharashtra"),
+            ("best district Cotton in Punjab and best in Goa in 2013", "Punjab", "Goa"),
+            ("Compare rainfall in the Kerala and the Punjab over the last 5 years", "Kerala", "Punjab"),
+            ("Compare rainfall in Bihar & the Kerala over the last 5 years", "Bihar", "Kerala"),
+        ]
+        for q, state_a, state_b in cases:
+            with self.subTest(q=q):
+                parsed = parse_question(q)
+                self.assertEqual(parsed.params["state_a"], state_a)
+                self.assertEqual(parsed.params["state_b"], state_b)
+
+    def test_question_parser_pair_phrasing_precedence(self):
+        # "for X and Y" outranks an earlier "in X and Y"
+        q = "Compare rainfall in Kerala and Punjab, then for Goa and Bihar, and list top 3 crops"
+        parsed = parse_question(q)
+        self.assertEqual(parsed.params["state_a"], "Goa")
+        self.assertEqual(parsed.params["state_b"], "Bihar")
+
     def test_question_parser_trend_rainfall(self):
         q = "Show the production trend of Wheat in Punjab over the last 10 years and compare it with the rainfall trend."
         parsed = parse_question(q)
@@ -66,6 +104,26 @@ class AnalyticsTestCase(unittest.TestCase):
         self.assertEqual(parsed.params["region"], "Punjab")
         self.assertEqual(parsed.params["crop"], "Wheat")
 
+    def test_question_parser_crop_before_any_state(self):
+        q = "district rice in West Bengal and Punjab"
+        parsed = parse_question(q)
+        self.assertEqual(parsed.intent, "district_extremes")
+        self.assertEqual(parsed.params["state_a"], "West Bengal")
+        self.assertEqual(parsed.params["state_b"], "Punjab")
+        self.assertEqual(parsed.params["crop"], "Rice")
+
+    def test_question_parser_crop_drops_extreme_words(self):
+        cases = [
+            ("lowest district Bajra in Andaman And Nicobar Islands and lowest in Atlantis during the past 3 years", "Bajra"),
+            ("Maximum district Maize in Andaman And Nicobar Islands and Tamil Nadu in the most recent year", "Maize"),
+            ("Identify the district in Atlantis, highest in Goa", None),
+        ]
+        for q, crop in cases:
+            with self.subTest(q=q):
+                parsed = parse_question(q)
+                self.assertEqual(parsed.intent, "district_extremes")
+                self.assertEqual(parsed.params["crop"], crop)
+
     def test_question_parser_policy_promote(self):
         q = "Should we promote millet over sugarcane in Maharashtra? Give policy arguments using climate data."
         parsed = parse_question(q)
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from app import main
+from app.query_executor import question_key
+
+
+QUESTION = (
+    "Compare the average annual rainfall in Karnataka and Maharashtra for the last 5 years. "
+    "List the top 3 most produced crops of Maize in each of those states during the same period."
+)
+
+
+class AskApiTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self._lifespan = main.app.router.lifespan_context(main.app)
+        await self._lifespan.__aenter__()
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test")
+        self.executions = 0
+        self.release = asyncio.Event()
+        executor = main.app.state.executor
+        execute_query = executor.execute_query
+
+        async def gated_execute_query(question):
+            # Hold the leading request open until the test lets it finish
+            self.executions += 1
+            await self.release.wait()
+            return await execute_query(question)
+
+        executor.execute_query = gated_execute_query
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        await self._lifespan.__aexit__(None, None, None)
+
+    async def _wait_for_inflight(self):
+        while question_key(QUESTION) not in main._inflight:
+            await asyncio.sleep(0)
+        return main._inflight[question_key(QUESTION)]
+
+    async def test_concurrent_identical_questions_share_one_execution(self):
+        requests = [asyncio.create_task(self.client.post("/ask", json={"question": QUESTION})) for _ in range(5)]
+        await self._wait_for_inflight()
+        self.release.set()
+        responses = await asyncio.gather(*requests)
+        self.assertEqual(self.executions, 1)
+        self.assertEqual([r.status_code for r in responses], [200] * 5)
+        self.assertEqual(len({r.text for r in responses}), 1)
+
+    async def test_case_and_padding_variants_share_one_execution(self):
+        variants = [QUESTION, QUESTION.upper(), f"  {QUESTION.lower()} "]
+        requests = [asyncio.create_task(self.client.post("/ask", json={"question": q})) for q in variants]
+        await self._wait_for_inflight()
+        self.release.set()
+        responses = await asyncio.gather(*requests)
+        self.assertEqual(self.executions, 1)
+        self.assertEqual(len({r.text for r in responses}), 1)
+
+    async def test_cancelled_waiter_leaves_shared_execution_running(self):
+        leader = asyncio.create_task(self.client.post("/ask", json={"question": QUESTION}))
+        inflight = await self._wait_for_inflight()
+        waiter = asyncio.create_task(self.client.post("/ask", json={"question": QUESTION}))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertFalse(inflight.cancelled())
+
+        self.release.set()
+        response = await leader
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.executions, 1)
+        self.assertEqual(inflight.result()["answer"], response.json()["answer"])
+
+    async def test_cancelled_leader_leaves_shared_execution_running(self):
+        leader = asyncio.create_task(self.client.post("/ask", json={"question": QUESTION}))
+        inflight = await self._wait_for_inflight()
+        followers = [asyncio.create_task(self.client.post("/ask", json={"question": QUESTION})) for _ in range(2)]
+        for _ in range(10):
+            await asyncio.sleep(0)
+        leader.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+        self.assertFalse(inflight.cancelled())
+
+        self.release.set()
+        responses = await asyncio.gather(*followers)
+        self.assertEqual([r.status_code for r in responses], [200, 200])
+        self.assertEqual(self.executions, 1)
+        self.assertNotIn(question_key(QUESTION), main._inflight)
+
+    async def test_ask_ndjson_line_framing(self):
+        self.release.set()
+        expected = (await self.client.post("/ask", json={"question": QUESTION})).json()
+        async with self.client.stream(
+            "POST", "/ask", json={"question": QUESTION}, headers={"Accept": "application/x-ndjson"}
+        ) as response:
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+            lines = [json.loads(line) async for line in response.aiter_lines()]
+        # The body is produced one newline-terminated line per chunk
+        chunks = list(main._iter_ndjson(expected))
+        self.assertEqual(len(chunks), len(lines))
+        self.assertTrue(all(chunk.endswith(b"\n") and chunk.count(b"\n") == 1 for chunk in chunks))
+
+        self.assertEqual(lines[0]["type"], "answer")
+        self.assertEqual(lines[0]["answer"], expected["answer"])
+        tables = []
+        for line in lines[1:]:
+            if line["type"] == "table":
+                self.assertEqual(line["table"], len(tables))
+                tables.append({"title": line["title"], "headers": line["headers"], "rows": []})
+            else:
+                self.assertEqual(line["type"], "row")
+                tables[line["table"]]["rows"].append(line["row"])
+        self.assertEqual(tables, expected["tables"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from app.config import load_config
+from app.data_manager import DataManager
+
+
+class DataManagerTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = load_config()
+
+    def setUp(self):
+        self.manager = DataManager(self.config)
+
+    def test_load_indexed_sorts_and_keeps_key_columns(self):
+        view = self.manager.load_indexed("agriculture", ("state", "crop"))
+        self.assertEqual(list(view.index.names), ["state", "crop"])
+        self.assertTrue(view.index.is_monotonic_increasing)
+        self.assertIn("state", view.columns)
+        self.assertIn("crop", view.columns)
+        self.assertEqual(len(view), len(self.manager.load_dataset("agriculture")))
+        rows = view.loc[("Karnataka", "Maize")]
+        self.assertTrue((rows["state"] == "Karnataka").all())
+        self.assertIs(self.manager.load_indexed("agriculture", ("state", "crop")), view)
+
+    def test_load_years_lists_newest_first(self):
+        df = self.manager.load_dataset("agriculture")
+        years = self.manager.load_years("agriculture", ("state",))
+        expected = sorted(df.loc[df["state"] == "Karnataka", "year"].unique().tolist(), reverse=True)
+        self.assertEqual(years["Karnataka"], tuple(expected))
+
+        pairs = self.manager.load_years("agriculture", ("state", "crop"))
+        mask = (df["state"] == "Karnataka") & (df["crop"] == "Maize")
+        expected = sorted(df.loc[mask, "year"].unique().tolist(), reverse=True)
+        self.assertEqual(pairs[("Karnataka", "Maize")], tuple(expected))
+
+    def test_load_state_year_means(self):
+        df = self.manager.load_dataset("rainfall")
+        means = self.manager.load_state_year_means("rainfall", "annual_rainfall_mm")
+        self.assertEqual(list(means.index.names), ["state", "year"])
+        state, year = means.index[0]
+        mask = (df["state"] == state) & (df["year"] == year)
+        self.assertAlmostEqual(means.loc[(state, year)], df.loc[mask, "annual_rainfall_mm"].mean())
+        self.assertIs(self.manager.load_state_year_means("rainfall", "annual_rainfall_mm"), means)
+
+    def test_version_bumps_on_refresh_and_drops_views(self):
+        self.manager.load_dataset("agriculture")
+        self.assertEqual(self.manager.version, 0)
+        view = self.manager.load_indexed("agriculture", ("state", "crop"))
+        means = self.manager.load_state_year_means("rainfall", "annual_rainfall_mm")
+
+        self.manager.load_dataset("agriculture", force_refresh=True)
+        self.assertEqual(self.manager.version, 1)
+        self.assertIsNot(self.manager.load_indexed("agriculture", ("state", "crop")), view)
+        # Views of other datasets survive a single dataset refresh
+        self.assertIs(self.manager.load_state_year_means("rainfall", "annual_rainfall_mm"), means)
+
+        self.manager.reload_all()
+        self.assertEqual(self.manager.version, 2)
+        self.assertIsNot(self.manager.load_state_year_means("rainfall", "annual_rainfall_mm"), means)
+
+    def test_source_frame_restores_source_schema(self):
+        df = self.manager.load_dataset("agriculture")
+        raw = self.manager._load_local_sample(self.manager.get_metadata("agriculture"))
+        source = DataManager.source_frame(df)
+        self.assertEqual(list(source.columns), list(raw.columns))
+        self.assertEqual(dict(source.dtypes), dict(raw.dtypes))
+        self.assertIn("crop_lower", df.columns)  # The cached frame is left as the pipeline expects
+
+    def test_view_of_replaced_frame_is_not_stored(self):
+        key = ("agriculture", "indexed", ("state",))
+
+        def build_during_refresh(df):
+            # A refresh lands while this view of the old frame is being built
+            self.manager.load_dataset("agriculture", force_refresh=True)
+            return df.set_index("state", drop=False)
+
+        stale = self.manager._load_derived("agriculture", key, build_during_refresh)
+        self.assertNotIn(key, self.manager._derived)
+        fresh = self.manager.load_indexed("agriculture", ("state",))
+        self.assertIsNot(fresh, stale)
+        self.assertIs(self.manager._derived[key], fresh)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import asyncio
+import unittest
+
+from app.event_bus import EventBus
+
+
+class EventBusTestCase(unittest.TestCase):
+    def test_history_keeps_last_100_events(self):
+        bus = EventBus()
+        bus.subscribe("tick", lambda event: None)
+        for i in range(150):
+            bus.publish("tick", i)
+        history = bus.get_event_history()
+        self.assertEqual(len(history), 100)
+        self.assertEqual(history[0].data, 50)
+        self.assertEqual(history[-1].data, 149)
+
+    def test_publish_async_runs_sync_and_async_handlers(self):
+        bus = EventBus()
+        seen = []
+
+        async def async_handler(event):
+            await asyncio.sleep(0)
+            seen.append(("async", event.data))
+
+        bus.subscribe("tick", lambda event: seen.append(("sync", event.data)))
+        bus.subscribe_async("tick", async_handler)
+        asyncio.run(bus.publish_async("tick", 1))
+        self.assertEqual(seen, [("sync", 1), ("async", 1)])
+
+    def test_publish_skips_async_handlers(self):
+        bus = EventBus()
+        seen = []
+
+        async def async_handler(event):
+            seen.append(event.data)
+
+        bus.subscribe_async("tick", async_handler)
+        bus.publish("tick", 1)
+        self.assertEqual(seen, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
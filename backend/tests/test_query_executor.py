@@ -0,0 +1,142 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from app.config import load_config
+from app.data_manager import DataManager
+from app.event_bus import Event, EventBus, event_bus
+from app.pipeline.base_stage import PipelineStage
+from app.query_executor import QueryExecutor
+from app.question_parser import parse_question
+
+
+QUESTION = "Show the production trend of Wheat in Punjab over the last 5 years and compare it with the rainfall trend."
+
+
+class SlowStage(PipelineStage):
+    """Pass-through stage that sleeps before handing its input on."""
+
+    delay = 0.1
+
+    def input_topic(self) -> str:
+        return "test.slow.input"
+
+    def output_topic(self) -> str:
+        return "test.slow.output"
+
+    def process(self, data, metadata):
+        time.sleep(self.delay)
+        return data
+
+
+class ResponseCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.manager = DataManager(load_config())
+
+    def setUp(self):
+        self.executor = QueryExecutor(parse_question, self.manager)
+        self.addCleanup(self.executor.close)
+        self.runs = 0
+        fast_path = self.executor._fast_path
+
+        def counting_fast_path(question, deadline):
+            self.runs += 1
+            return fast_path(question, deadline)
+
+        self.executor._fast_path = counting_fast_path
+
+    async def test_repeated_question_is_served_from_cache(self):
+        first = await self.executor.execute_query(QUESTION)
+        second = await self.executor.execute_query(QUESTION)
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(first, second)
+
+    async def test_case_and_padding_variants_share_an_entry(self):
+        first = await self.executor.execute_query(QUESTION)
+        second = await self.executor.execute_query(f"  {QUESTION.upper()}\n")
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.executor._resp_cache), 1)
+
+    async def test_expired_entry_is_recomputed(self):
+        await self.executor.execute_query(QUESTION)
+        # Age the entry past the TTL instead of sleeping through it
+        for key, (stored_at, response) in list(self.executor._resp_cache.items()):
+            self.executor._resp_cache[key] = (stored_at - self.executor._resp_ttl, response)
+        await self.executor.execute_query(QUESTION)
+        self.assertEqual(self.runs, 2)
+        self.assertEqual(len(self.executor._resp_cache), 1)
+
+    async def test_version_bump_invalidates_cache(self):
+        await self.executor.execute_query(QUESTION)
+        self.manager.version += 1
+        await self.executor.execute_query(QUESTION)
+        self.assertEqual(self.runs, 2)
+
+    async def test_cached_responses_are_isolated_copies(self):
+        first = await self.executor.execute_query(QUESTION)
+        first["answer"] = "changed"
+        first["tables"][0]["rows"].clear()
+        second = await self.executor.execute_query(QUESTION)
+        second["tables"][0]["headers"].append("extra")
+        third = await self.executor.execute_query(QUESTION)
+        self.assertEqual(self.runs, 1)
+        self.assertNotEqual(second["answer"], "changed")
+        self.assertTrue(second["tables"][0]["rows"])
+        self.assertNotIn("extra", third["tables"][0]["headers"])
+
+
+class DeadlineTestCase(unittest.IsolatedAsyncioTestCase):
+    def test_run_raises_once_deadline_has_passed(self):
+        stage = SlowStage(EventBus())
+        self.assertEqual(stage.run("data", {"deadline": time.monotonic() + 5}), "data")
+        with self.assertRaises(asyncio.TimeoutError):
+            stage.run("data", {"deadline": time.monotonic() - 1})
+
+    async def test_slow_stage_times_out_query(self):
+        executor = QueryExecutor(parse_question, DataManager(load_config()))
+        self.addCleanup(executor.close)
+        # The slow stage outlasts the deadline, so the next stage boundary trips it
+        executor._stages = (SlowStage(EventBus()),) + executor._stages
+        with mock.patch("app.query_executor.QUERY_TIMEOUT", SlowStage.delay / 2):
+            with self.assertRaises(asyncio.TimeoutError):
+                await executor.execute_query(QUESTION)
+        self.assertEqual(len(executor._resp_cache), 0)
+
+    async def test_pipelined_deadline_times_out_query(self):
+        executor = QueryExecutor(parse_question, DataManager(load_config()), pipelined=True)
+        self.addCleanup(executor.close)
+        self.addCleanup(event_bus.clear_subscribers)
+        process = executor.data_stage.process
+
+        def overrunning_process(data, metadata):
+            # Expire the deadline as if this stage had overrun it
+            result = process(data, metadata)
+            metadata["deadline"] = time.monotonic() - 1
+            return result
+
+        executor.data_stage.process = overrunning_process
+        with self.assertRaises(asyncio.TimeoutError):
+            await executor.execute_query(QUESTION)
+        self.assertEqual(len(executor._resp_cache), 0)
+
+    async def test_pipeline_error_keeps_timeouts_distinct(self):
+        executor = QueryExecutor(parse_question, DataManager(load_config()), pipelined=True)
+        self.addCleanup(executor.close)
+        self.addCleanup(event_bus.clear_subscribers)
+        loop = asyncio.get_running_loop()
+        for error_type, expected in ((asyncio.TimeoutError, asyncio.TimeoutError), (KeyError, Exception)):
+            with self.subTest(error_type=error_type.__name__):
+                future = executor._pending["req"] = loop.create_future()
+                executor._handle_error(Event(
+                    topic="pipeline.error",
+                    data={"error": "boom", "error_type": error_type, "stage": "AnalysisStage"},
+                    metadata={"req_id": "req"},
+                ))
+                self.assertIs(type(future.exception()), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
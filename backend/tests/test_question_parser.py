@@ -0,0 +1,23 @@
+import json
+import unittest
+from pathlib import Path
+
+from app.question_parser import parse_question
+
+
+REGRESSION_FIXTURE = Path(__file__).with_name("parser_regression.json")
+
+
+class QuestionParserRegressionTestCase(unittest.TestCase):
+    def test_regression_questions(self):
+        # Question phrasings crossed with known, multi-word, mixed-case and unknown states
+        cases = json.loads(REGRESSION_FIXTURE.read_text())
+        for case in cases:
+            with self.subTest(question=case["question"]):
+                parsed = parse_question(case["question"])
+                self.assertEqual(parsed.intent, case["intent"])
+                self.assertEqual(parsed.params, case["params"])
+
+
+if __name__ == "__main__":
+    unittest.main()